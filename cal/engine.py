@@ -0,0 +1,596 @@
+## codyssey part5 - 2 [engine] ##
+## Mariner_정찬수 ##
+
+# PyQt5 없이 동작하는 계산기 상태 머신.
+# Calculator / EngineeringCalculator 위젯은 버튼 입력을 여기로 넘기고 display, process_display 문자열만 화면에 옮긴다.
+# GUI 없이 바로 import 할 수 있어서 명령줄 계산이나 일괄 처리에 그대로 쓸 수 있다.
+#   python engine.py "3 + (1 + 2) x 2" "sin(30)" --deg
+#   python engine.py --keys "3 + ( 1 + 2 ) x 2 ="
+#   python engine.py --file exprs.txt
+#   python engine.py "0.1 + 0.2" --precision 50
+#   python engine.py "1÷3 + 1÷6" --exact
+#   python engine.py --history sin      (기록 검색)   python engine.py --replay 0   (가장 최근 수식 다시 계산)
+
+import argparse
+import random
+import sys
+
+import expression
+from history import HISTORY_CAP, HISTORY_FILE, History
+from numeric import FLOAT, make_numeric
+
+
+class CalculatorEngine:
+    # 기본 계산기 (Calculator 위젯과 같은 규칙)
+    OPERATORS = {"+", "-", "x", "÷"}
+
+    def __init__(self, numeric=FLOAT):
+        # numeric: 수 체계 backend (numeric.make_numeric). 기본 float이면 기존 동작 그대로
+        self.numeric = numeric
+        self.display = "0"
+        self.process_display = ""
+        self.reset_state()
+
+    def reset_state(self):
+        self._operand = None
+        self._operator = None
+        self._waiting_for_new = False
+        self.process_display = ""
+
+    def reset(self):
+        self.display = "0"
+        self.reset_state()
+
+    def press(self, keys) -> str:
+        # 버튼 라벨을 순서대로 입력하고 최종 디스플레이 값을 반환
+        for key in keys:
+            self.on_input(key)
+        return self.display
+
+    def on_input(self, text: str):
+        if text in self.OPERATORS:
+            self._on_operator(text)
+            return
+        elif text == "=":
+            self.equal()
+            return
+        elif text == "%":
+            self.percent()
+            return
+        elif text == "AC":
+            self.reset()
+            return
+        elif text == "+/-":
+            self.negative_positive()
+            return
+
+        self._input_digit(text)
+
+    def _input_digit(self, text: str):
+        cur = self.display
+
+        if self._waiting_for_new or cur == "0":
+            if text == ".":
+                self.display = "0."
+            elif text.isdigit():
+                self.display = text
+            else:
+                return
+            self._waiting_for_new = False
+            return
+
+        if text == "." and "." in cur: # 연속 dot 방지
+            return
+
+        if text.isdigit() or text == ".":
+            self.display = cur + text
+
+    def _on_operator(self, op):
+        cur = self.display
+        try:
+            value = self.numeric.parse(cur)
+        except Exception:
+            value = self.numeric.number("0")
+        if self._operator and not self._waiting_for_new:
+            # 연산자 연속 입력이 아니면 이전 연산 처리
+            self.equal()
+            value = self.numeric.parse(self.display)
+        self._operand = value
+        self._operator = op
+        self._waiting_for_new = True
+        self.process_display = f"{self._format_result(self._operand)} {op}"
+
+    def equal(self):
+        if self._operator is None or self._operand is None:
+            return
+        try:
+            right = self.numeric.parse(self.display)
+        except Exception:
+            right = self.numeric.number("0")
+        result = self._calculate(self._operand, right, self._operator)
+        self.process_display = f"{self._format_result(self._operand)} {self._operator} {self._format_result(right)} ="
+        self.display = self._format_result(result)
+        self._operand = None
+        self._operator = None
+        self._waiting_for_new = True
+
+    def percent(self):
+        cur = self.display
+        try:
+            value = self.numeric.parse(cur)
+            value = value / 100
+            self.display = self._format_result(value)
+        except Exception:
+            pass
+
+    def _calculate(self, left, right, op):
+        with self.numeric.context():
+            try:
+                if op == "+":
+                    return self.add(left, right)
+                elif op == "-":
+                    return self.subtract(left, right)
+                elif op == "x":
+                    return self.multiply(left, right)
+                elif op == "÷":
+                    if right == 0:
+                        return "Error"
+                    return self.divide(left, right)
+            except Exception:
+                return "Error"
+
+    def add(self, left, right):
+        return (left) + (right)
+
+    def subtract(self, left, right):
+        return (left) - (right)
+
+    def multiply(self, left, right):
+        return (left) * (right)
+
+    def divide(self, left, right):
+        return (left) / (right)
+
+    def _format_result(self, value):
+        if isinstance(value, str):
+            return value
+        try:
+            return self.numeric.format(value)
+        except Exception:
+            return str(value)
+
+    def negative_positive(self):
+        s = self.display
+        if s == "0":
+            return
+        if s.startswith("-"):
+            s = s[1:]
+        else:
+            s = "-" + s
+        self.display = s
+
+
+class EngineeringEngine(CalculatorEngine):
+    # 공학용 계산기 (EngineeringCalculator 위젯과 같은 규칙)
+    OPERATORS = {"+", "-", "x", "÷", "ʸ√x", "xʸ"}
+
+    def __init__(self, numeric=FLOAT, history=None):
+        self.angle_mode = "Rad" # or "Deg"
+        self._expr = None # 괄호 입력 중인 수식 조각 목록 (None이면 기존 한 단계 연산 모드)
+        self._depth = 0
+        self.memory = None # mc/m+/m-/mr 메모리 (None이면 비어 있음)
+        self.history = history # history.History. None이면 기록하지 않음
+        super().__init__(numeric)
+
+    # ---------- state ----------
+    def reset_state(self):
+        self._operand = None
+        self._operator = None
+        self._waiting_for_new = True
+        self._expr = None
+        self._depth = 0
+        self.display = "0"
+        self.process_display = ""
+
+    def reset(self):
+        self.reset_state()
+
+    def on_input(self, text: str):
+        if text == "(":
+            self.open_paren()
+            return
+        elif text == ")":
+            self.close_paren()
+            return
+        elif text in self.MEMORY_KEYS:
+            getattr(self, self.MEMORY_KEYS[text])()
+            return
+        super().on_input(text)
+
+    # ---------- memory ----------
+    MEMORY_KEYS = {"mc": "memory_clear", "m+": "memory_add", "m-": "memory_subtract", "mr": "memory_recall"}
+
+    def memory_clear(self):
+        self.memory = None
+
+    def _memory_update(self, sign: int):
+        x = self._get_current_value()
+        base = self.memory if self.memory is not None else self.numeric.number("0")
+        try:
+            with self.numeric.context():
+                self.memory = base + x if sign > 0 else base - x
+        except Exception: # float 범위 밖의 값 등. 메모리는 그대로 두고 Error 표시
+            self.display = "Error"
+        self._waiting_for_new = True
+
+    def memory_add(self):
+        self._memory_update(1)
+
+    def memory_subtract(self):
+        self._memory_update(-1)
+
+    def memory_recall(self):
+        value = self.memory if self.memory is not None else self.numeric.number("0")
+        self._insert_number(value)
+
+    # ---------- history ----------
+    def _record(self):
+        # "=" 직후 process_display("... =")와 결과를 기록
+        if self.history is not None:
+            self.history.append(self.process_display.rstrip(" ="), self.display, self.angle_mode)
+
+    def recall_history(self, index: int = 0):
+        # 지난 결과를 다시 입력 (0이 가장 최근). 기록이 연결되지 않은 엔진에서는 아무것도 하지 않음
+        if self.history is None:
+            return
+        self.display = self.history.recall(index)["result"]
+        self._waiting_for_new = False
+
+    def replay_history(self, index: int = 0):
+        # 지난 수식을 기록 당시 각도 모드로 다시 계산 (컴파일 캐시를 쓰므로 다시 파싱하지 않음)
+        if self.history is None:
+            return
+        entry = self.history.recall(index)
+        self.process_display = f"{entry['expr']} ="
+        self.display = self.evaluate(entry["expr"], entry.get("angle_mode"))
+        self._waiting_for_new = True
+
+    # ---------- unary operations ----------
+    def _get_current_value(self) -> float:
+        try:
+            return self.numeric.parse(self.display)
+        except Exception:
+            return self.numeric.number("0")
+
+    def factorial(self):
+        x = self._get_current_value()
+        try:
+            val = self.numeric.factorial(x)
+        except Exception:
+            val = "Error"
+        self.display = self._format_result(val)
+        self._waiting_for_new = False
+
+    def _angle(self, func):
+        # Deg 모드이면 입력을 라디안으로 바꿔서 삼각함수에 넘긴다
+        def _wrapper(x):
+            return func(self.numeric.radians(x) if self.angle_mode == "Deg" else x)
+        return _wrapper
+
+    def func_sin(self):
+        self._apply_unary(self._angle(self.numeric.sin))
+
+    def func_cos(self):
+        self._apply_unary(self._angle(self.numeric.cos))
+
+    def func_tan(self):
+        self._apply_unary(self._angle(self.numeric.tan))
+
+    # Hyperbolic functions do not use Deg/Rad; they take the raw value.
+    def func_sinh(self):
+        self._apply_unary(self.numeric.sinh)
+
+    def func_cosh(self):
+        self._apply_unary(self.numeric.cosh)
+
+    def func_tanh(self):
+        self._apply_unary(self.numeric.tanh)
+
+    def square(self):
+        self._apply_unary(lambda x: x * x)
+
+    def cube(self):
+        self._apply_unary(lambda x: x * x * x)
+
+    def inverse(self):
+        self._apply_unary(lambda x: 1 / x) # 0은 ZeroDivisionError -> Error
+
+    def square_root(self):
+        self._apply_unary(self.numeric.sqrt) # 음수는 ValueError -> Error
+
+    def cube_root(self):
+        self._apply_unary(self.numeric.cbrt)
+
+    def natural_log(self):
+        self._apply_unary(self.numeric.ln) # 0 이하는 ValueError -> Error
+
+    def log_base_10(self):
+        self._apply_unary(self.numeric.log10)
+
+    # ---------- exp / inverse functions ("2nd" layer) ----------
+    def _apply_unary(self, func):
+        x = self._get_current_value()
+        try:
+            with self.numeric.context():
+                val = func(x)
+        except Exception:
+            val = "Error"
+        self.display = self._format_result(val)
+        self._waiting_for_new = False
+
+    def _inverse_angle(self, func):
+        # 역삼각함수 결과는 Deg 모드이면 도(degree)로
+        def _wrapper(x):
+            val = func(x)
+            return self.numeric.degrees(val) if self.angle_mode == "Deg" else val
+        return _wrapper
+
+    def func_exp(self):
+        self._apply_unary(self.numeric.exp)
+
+    def func_10x(self):
+        self._apply_unary(lambda x: self.numeric.power(self.numeric.number("10"), x))
+
+    def func_2x(self):
+        self._apply_unary(lambda x: self.numeric.power(self.numeric.number("2"), x))
+
+    def log_base_2(self):
+        self._apply_unary(self.numeric.log2)
+
+    def func_asin(self):
+        self._apply_unary(self._inverse_angle(self.numeric.asin))
+
+    def func_acos(self):
+        self._apply_unary(self._inverse_angle(self.numeric.acos))
+
+    def func_atan(self):
+        self._apply_unary(self._inverse_angle(self.numeric.atan))
+
+    def func_asinh(self):
+        self._apply_unary(self.numeric.asinh)
+
+    def func_acosh(self):
+        self._apply_unary(self.numeric.acosh)
+
+    def func_atanh(self):
+        self._apply_unary(self.numeric.atanh)
+
+    def insert_random(self):
+        self._insert_number(self.numeric.number(repr(random.random())))
+
+    def insert_pi(self):
+        self._insert_number(self.numeric.pi)
+
+    def insert_e(self):
+        self._insert_number(self.numeric.e)
+
+    def _insert_number(self, num):
+        self.display = self._format_result(num)
+        self._waiting_for_new = False
+
+    def toggle_angle_mode(self):
+        self.angle_mode = "Deg" if self.angle_mode == "Rad" else "Rad"
+
+    # ---------- percent ----------
+    def percent(self):
+        try:
+            val = self.numeric.parse(self.display)
+            self.display = self._format_result(val / 100)
+            self._waiting_for_new = False
+        except Exception:
+            pass
+
+    # ---------- parentheses (expression mode) ----------
+    # "("를 누르면 그때부터 입력을 수식 문자열로 모아두고 "="에서 expression 모듈로 한 번에 계산한다.
+    def _push_value(self):
+        # 직전 조각이 ")"가 아니면 디스플레이 값을 수식에 넣는다
+        if not self._expr or self._expr[-1] != ")":
+            self._expr.append(self.display)
+
+    def open_paren(self):
+        if self._expr is None:
+            # 대기 중인 한 단계 연산(예: "3 +")을 수식 앞부분으로 옮긴다
+            self._expr = []
+            if self._operator is not None:
+                self._expr += [self._format_result(self._operand), self._operator]
+                self._operand = None
+                self._operator = None
+        if not self._waiting_for_new or (self._expr and self._expr[-1] == ")"):
+            self._push_value() # 2(3+4), (1+2)(3+4) 처럼 곱셈 생략
+        self._expr.append("(")
+        self._depth += 1
+        self._waiting_for_new = True
+        self.process_display = " ".join(self._expr)
+
+    def close_paren(self):
+        if self._expr is None or self._depth == 0:
+            return
+        self._push_value()
+        self._expr.append(")")
+        self._depth -= 1
+        self._waiting_for_new = True
+        self.process_display = " ".join(self._expr)
+
+    def _expr_operator(self, op_symbol: str):
+        if self._waiting_for_new and self._expr and self._expr[-1] in self.OPERATORS:
+            self._expr[-1] = op_symbol # 연산자 연속 입력은 마지막 것으로 교체
+        else:
+            self._push_value()
+            self._expr.append(op_symbol)
+        self._waiting_for_new = True
+        self.process_display = " ".join(self._expr)
+
+    def _expr_equal(self):
+        self._push_value()
+        self._expr += [")"] * self._depth # 닫지 않은 괄호는 자동으로 닫음
+        text = " ".join(self._expr)
+        self.process_display = f"{text} ="
+        self.display = self.evaluate(text)
+        self._expr = None
+        self._depth = 0
+        self._waiting_for_new = True
+        self._record()
+
+    def evaluate(self, text: str, angle_mode: str | None = None) -> str:
+        # 수식 문자열 하나를 (지정하지 않으면 현재) 각도 모드로 계산해서 디스플레이 형식으로 반환
+        try:
+            result = expression.evaluate(text, angle_mode or self.angle_mode, self.numeric)
+        except (ArithmeticError, ValueError):
+            result = "Error"
+        return self._format_result(result)
+
+    # ---------- binary operations ----------
+    def _on_operator(self, op_symbol: str):
+        if self._expr is not None:
+            self._expr_operator(op_symbol)
+            return
+
+        cur_val = self._get_current_value()
+
+        if self._operator is not None and not self._waiting_for_new:
+            res = self._calculate(self._operand, cur_val, self._operator)
+            if res == "Error":
+                self.process_display = ""
+                self.display = "Error"
+                self._operand = None
+                self._operator = None
+                self._waiting_for_new = True
+                return
+            self.display = self._format_result(res)
+            self._operand = res
+        else:
+            self._operand = cur_val
+
+        self._operator = op_symbol
+        self._waiting_for_new = True
+        self.process_display = f"{self._format_result(self._operand)} {op_symbol}"
+
+    def equal(self):
+        if self._expr is not None:
+            self._expr_equal()
+            return
+        if self._operator is None or self._operand is None:
+            return
+        right = self._get_current_value()
+        result = self._calculate(self._operand, right, self._operator)
+        self.process_display = f"{self._format_result(self._operand)} {self._operator} {self._format_result(right)} ="
+        self.display = self._format_result(result)
+        self._operand = None
+        self._operator = None
+        self._waiting_for_new = True
+        self._record()
+
+    def _calculate(self, left, right, op):
+        with self.numeric.context():
+            try:
+                if op == "+":
+                    return self.add(left, right)
+                elif op == "-":
+                    return self.subtract(left, right)
+                elif op == "x":
+                    return self.multiply(left, right)
+                elif op == "÷":
+                    if right == 0:
+                        return "Error"
+                    return self.divide(left, right)
+                elif op == "ʸ√x":
+                    if right == 0:
+                        return "Error"
+                    return self.y_root(left, right)
+                elif op == "xʸ":
+                    return self.numeric.power(left, right)
+            except Exception:
+                return "Error"
+
+    def y_root(self, x, y):
+        if y == 0:
+            return "Error"
+        elif x >= 0:
+            return self.numeric.root(x, y)
+        else:
+            if int(y) != y or int(y) % 2 == 0:
+                return "Error"
+            else:
+                return -self.numeric.root(-x, y)
+
+    def add(self, left, right) -> float | str:
+        return left + right
+
+    def subtract(self, left, right) -> float | str:
+        return left - right
+
+    def multiply(self, left, right) -> float | str:
+        return left * right
+
+    def divide(self, left, right) -> float | str:
+        return left / right
+
+
+def main():
+    parser = argparse.ArgumentParser(description="headless engineering calculator")
+    parser.add_argument("exprs", nargs="*", help="expressions to evaluate, e.g. \"3 + (1 + 2) x 2\"")
+    parser.add_argument("--file", help="evaluate one expression per line ('-' for stdin)")
+    parser.add_argument("--keys", help="space separated button labels to press, e.g. \"1 + 2 =\"")
+    parser.add_argument("--deg", action="store_true", help="use degrees for sin/cos/tan")
+    parser.add_argument("--precision", type=int, help="significant digits (switches to decimal arithmetic)")
+    parser.add_argument("--exact", action="store_true", help="exact rational arithmetic (fractions)")
+    parser.add_argument("--record", action="store_true", help="append the evaluated expressions to the history")
+    parser.add_argument("--history", nargs="?", const="", metavar="TEXT", help="list history entries (containing TEXT)")
+    parser.add_argument("--replay", type=int, metavar="N", help="re-evaluate the N-th most recent history entry")
+    parser.add_argument("--recall", type=int, metavar="N", help="start from the result of the N-th most recent entry (use with --keys)")
+    parser.add_argument("--history-file", default=HISTORY_FILE, help=f"history file (default: {HISTORY_FILE})")
+    parser.add_argument("--history-cap", type=int, default=HISTORY_CAP, help="number of entries kept in memory")
+    args = parser.parse_args()
+
+    mode = "fraction" if args.exact else "decimal"
+    history = History(args.history_file, args.history_cap)
+    engine = EngineeringEngine(make_numeric(mode, args.precision), history)
+    if args.deg:
+        engine.angle_mode = "Deg"
+
+    if args.history is not None:
+        for i, entry in history.search(args.history):
+            print(f"[{i}] {entry['time']}  {entry['expr']} = {entry['result']}")
+        return
+
+    try:
+        if args.replay is not None:
+            engine.replay_history(args.replay)
+            print(engine.process_display, engine.display)
+            return
+        if args.recall is not None:
+            engine.recall_history(args.recall)
+    except IndexError:
+        parser.error(f"no history entry {args.replay if args.replay is not None else args.recall}")
+
+    if args.keys:
+        print(engine.press(args.keys.split()))
+        return
+    if args.recall is not None:
+        print(engine.display)
+        return
+
+    exprs = list(args.exprs)
+    if args.file:
+        f = sys.stdin if args.file == "-" else open(args.file, "r", encoding="utf-8")
+        with f:
+            exprs += [line.strip() for line in f if line.strip()]
+    for expr in exprs:
+        result = engine.evaluate(expr)
+        if args.record:
+            history.append(expr, result, engine.angle_mode)
+        print(f"{expr} = {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+## codyssey part5 - 2 [expression] ##
+## Mariner_정찬수 ##
+
+# 계산기용 수식 엔진.
+# 중위 표기 수식(괄호, 우선순위, 공학 함수 포함)을 토큰으로 나누고 precedence climbing으로 파싱한 뒤,
+# 트리를 다시 순회하지 않도록 중첩된 함수(closure)로 컴파일해둔다.
+# 컴파일 결과는 정규화된 수식 문자열을 키로 LRU 캐시에 저장해서 같은 수식을 다시 계산하거나
+# 기록을 재생할 때는 파싱을 건너뛴다.
+
+import functools
+import re
+
+from numeric import FLOAT
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+# 버튼 라벨/유니코드 기호를 파서가 쓰는 표기로 통일
+_REPLACE = [
+    ("ʸ√x", " yroot "), ("ʸ√", " yroot "), ("xʸ", "^"), ("log₁₀", "log"), ("×", "x"), ("*", "x"),
+    ("/", "÷"), ("−", "-"), ("π", " pi "), ("²√", "√"), ("³√", "∛"),
+]
+
+_NAMES = ["yroot", "sinh", "cosh", "tanh", "sin", "cos", "tan", "sqrt", "cbrt", "exp", "inv", "abs", "fact",
+          "log", "ln", "pi", "e", "x"]
+_TOKEN = re.compile(r"""
+    (?P<num>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>""" + "|".join(_NAMES) + r""")
+  | (?P<op>[-+÷^()!²³√∛])
+  | (?P<var>[A-Z])
+""", re.VERBOSE)
+
+# 이항 연산자: (우선순위, 오른쪽 결합 여부)
+_BINARY = {"+": (1, False), "-": (1, False), "x": (2, False), "÷": (2, False), "^": (4, True), "yroot": (4, False)}
+_UNARY_PREC = 3 # -2^2 = -4 가 되도록 거듭제곱보다 낮게
+_POSTFIX = {"!", "²", "³"}
+_PREFIX = {"√": "sqrt", "∛": "cbrt"}
+_CONSTANTS = {"pi", "e"}
+
+
+def _divide(numeric, left, right):
+    if right == 0:
+        raise ZeroDivisionError("division by zero")
+    return left / right
+
+
+def _y_root(numeric, x, y):
+    # EngineeringCalculator.y_root와 같은 규칙 (음수는 홀수 차수 근만 허용)
+    if y == 0:
+        raise ValueError("zero root")
+    if x >= 0:
+        return numeric.root(x, y)
+    if int(y) != y or int(y) % 2 == 0:
+        raise ValueError("even root of negative number")
+    return -numeric.root(-x, y)
+
+
+def _power(numeric, x, y):
+    # 음수의 정수가 아닌 거듭제곱은 복소수가 되므로 Error (ʸ√x와 같은 규칙)
+    if x < 0 and int(y) != y:
+        raise ValueError("fractional power of negative number")
+    return numeric.power(x, y)
+
+
+# 함수 이름 -> numeric backend 메서드. 각도를 쓰는 함수는 angle_mode에 따라 변환
+_ANGLE_FUNCS = {"sin", "cos", "tan"}
+_FUNCS = {
+    "sinh": "sinh", "cosh": "cosh", "tanh": "tanh", "ln": "ln", "log": "log10", "sqrt": "sqrt",
+    "cbrt": "cbrt", "exp": "exp", "fact": "factorial",
+}
+_SPECIAL_FUNCS = {
+    "inv": lambda numeric, x: _divide(numeric, 1, x), "abs": lambda numeric, x: abs(x),
+}
+_BINARY_FUNCS = {
+    "+": lambda n, a, b: a + b, "-": lambda n, a, b: a - b, "x": lambda n, a, b: a * b,
+    "÷": _divide, "^": _power, "yroot": _y_root,
+}
+_POSTFIX_FUNCS = {"!": lambda n, a: n.factorial(a), "²": lambda n, a: a * a, "³": lambda n, a: a * a * a}
+
+
+def normalize(expr: str) -> str:
+    # 캐시 키: 기호를 통일하고 토큰 사이를 공백 하나로 맞춘 문자열
+    for old, new in _REPLACE:
+        expr = expr.replace(old, new)
+    return " ".join(tokenize(expr))
+
+
+def tokenize(expr: str) -> list:
+    tokens = []
+    pos = 0
+    expr = expr.strip()
+    while pos < len(expr):
+        if expr[pos].isspace():
+            pos += 1
+            continue
+        m = _TOKEN.match(expr, pos)
+        if not m:
+            raise ExpressionError(f"Unexpected character {expr[pos]!r} at {pos}")
+        tokens.append(m.group())
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        tok = self.peek()
+        self.pos += 1
+        return tok
+
+    def parse(self):
+        node = self.expression(1)
+        if self.peek() is not None:
+            raise ExpressionError(f"Unexpected token {self.peek()!r}")
+        return node
+
+    def expression(self, min_prec: int):
+        left = self.unary()
+        while True:
+            tok = self.peek()
+            if tok in _BINARY:
+                prec, right_assoc = _BINARY[tok]
+            elif tok is not None and self._starts_operand(tok):
+                prec, right_assoc = _BINARY["x"] # 2π, 3(4+5) 처럼 생략된 곱셈
+                tok = None
+            else:
+                break
+            if prec < min_prec:
+                break
+            if tok is not None:
+                self.take()
+            right = self.expression(prec if right_assoc else prec + 1)
+            left = ("bin", tok or "x", left, right)
+        return left
+
+    def unary(self):
+        tok = self.peek()
+        if tok in ("-", "+"):
+            self.take()
+            operand = self.expression(_UNARY_PREC)
+            return ("neg", operand) if tok == "-" else operand
+        return self.postfix()
+
+    def postfix(self):
+        node = self.primary()
+        while self.peek() in _POSTFIX:
+            node = ("post", self.take(), node)
+        return node
+
+    def primary(self):
+        tok = self.take()
+        if tok is None:
+            raise ExpressionError("Unexpected end of expression")
+        if tok == "(":
+            node = self.expression(1)
+            if self.take() != ")":
+                raise ExpressionError("Missing ')'")
+            return node
+        if tok in _PREFIX:
+            return ("func", _PREFIX[tok], self.unary())
+        if tok in _CONSTANTS:
+            return ("const", tok)
+        if tok in _ANGLE_FUNCS or tok in _FUNCS or tok in _SPECIAL_FUNCS:
+            # sin(30), sin 30 모두 허용. 인자는 괄호 또는 단항식
+            return ("func", tok, self.unary())
+        if tok[0].isdigit() or tok[0] == ".":
+            return ("num", tok)
+        if tok.isupper():
+            return ("var", tok) # 대문자 한 글자는 변수 (배열 일괄 계산용)
+        raise ExpressionError(f"Unexpected token {tok!r}")
+
+    @staticmethod
+    def _starts_operand(tok: str) -> bool:
+        return tok == "(" or tok in _PREFIX or tok[0].isdigit() or tok[0] == "." or tok.isalpha() and tok not in _BINARY
+
+
+def parse(expr: str):
+    return _Parser(tokenize(normalize(expr))).parse()
+
+
+def _compile_node(node):
+    # 트리를 closure로 변환. 반환 함수는 angle_mode("Rad"/"Deg")와 numeric backend를 받아 값을 계산
+    kind = node[0]
+    if kind == "num":
+        text, value = node[1], float(node[1])
+        # 기본 float backend는 미리 변환해둔 값을 그대로 쓴다
+        return lambda angle_mode, numeric: value if numeric is FLOAT else numeric.number(text)
+    if kind == "const":
+        name = node[1]
+        return lambda angle_mode, numeric: getattr(numeric, name)
+    if kind == "neg":
+        operand = _compile_node(node[1])
+        return lambda angle_mode, numeric: -operand(angle_mode, numeric)
+    if kind == "bin":
+        func = _BINARY_FUNCS[node[1]]
+        left, right = _compile_node(node[2]), _compile_node(node[3])
+        return lambda angle_mode, numeric: func(numeric, left(angle_mode, numeric), right(angle_mode, numeric))
+    if kind == "post":
+        func = _POSTFIX_FUNCS[node[1]]
+        operand = _compile_node(node[2])
+        return lambda angle_mode, numeric: func(numeric, operand(angle_mode, numeric))
+    if kind == "func":
+        name, operand = node[1], _compile_node(node[2])
+        if name in _ANGLE_FUNCS:
+            def _angle_func(angle_mode, numeric):
+                x = operand(angle_mode, numeric)
+                return getattr(numeric, name)(numeric.radians(x) if angle_mode == "Deg" else x)
+            return _angle_func
+        if name in _SPECIAL_FUNCS:
+            func = _SPECIAL_FUNCS[name]
+            return lambda angle_mode, numeric: func(numeric, operand(angle_mode, numeric))
+        method = _FUNCS[name]
+        return lambda angle_mode, numeric: getattr(numeric, method)(operand(angle_mode, numeric))
+    if kind == "var":
+        raise ExpressionError(f"Variable {node[1]!r} needs array evaluation (vectorized.evaluate_array)")
+    raise ExpressionError(f"Unknown node {kind}")
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_normalized(normalized: str):
+    return _compile_node(_Parser(normalized.split(" ") if normalized else []).parse())
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_expression(expr: str):
+    # 같은 문자열이면 정규화(토큰화)도 건너뛰고, 표기만 다른 수식은 정규화한 문자열로 컴파일 결과를 공유
+    return _compile_normalized(normalize(expr))
+
+
+def evaluate(expr: str, angle_mode: str = "Rad", numeric=FLOAT):
+    # numeric: numeric.make_numeric()으로 만든 backend (기본은 float)
+    func = compile_expression(expr)
+    with numeric.context():
+        return func(angle_mode, numeric)
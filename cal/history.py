@@ -0,0 +1,108 @@
+## codyssey part5 - 2 [history] ##
+## Mariner_정찬수 ##
+
+# 계산 기록. 메모리에는 최근 cap개만 링 버퍼(deque)로 두고, 파일에는 한 줄에 하나씩(JSON) 덧붙이기만 한다.
+# 파일은 기록을 처음 조회할 때 끝에서부터 필요한 만큼만 읽으므로 기록이 쌓여도 시작 시간은 늘지 않는다.
+# 파일이 max_bytes를 넘으면 (불러올 때나 덧붙인 직후) 최근 cap개만 남기도록 임시 파일 + os.replace로 정리한다.
+
+import collections
+import datetime
+import json
+import os
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.jsonl")
+HISTORY_CAP = 1000
+BLOCK_SIZE = 64 * 1024
+
+
+def _tail_lines(path: str, count: int) -> list:
+    # 파일 끝에서부터 블록 단위로 읽어서 마지막 count줄 반환
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= count:
+            step = min(BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines()
+    if pos > 0:
+        lines = lines[1:] # 블록 경계에서 잘린 첫 줄은 버림
+    return lines[-count:] if count else []
+
+
+class History:
+    def __init__(self, path: str = HISTORY_FILE, cap: int = HISTORY_CAP, max_bytes: int | None = None):
+        self.path = path
+        self.cap = cap
+        self.max_bytes = max_bytes if max_bytes is not None else cap * 512
+        self._entries = collections.deque(maxlen=cap)
+        self._loaded = False
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        pending = list(self._entries) # 불러오기 전에 추가된 기록은 파일에도 이미 있다
+        self._entries.clear()
+        for line in _tail_lines(self.path, self.cap):
+            try:
+                self._entries.append(json.loads(line))
+            except (ValueError, UnicodeDecodeError):
+                continue # 쓰다가 끊긴 줄은 건너뜀
+        if not self._entries:
+            self._entries.extend(pending)
+        if os.path.getsize(self.path) > self.max_bytes:
+            self.compact()
+
+    def compact(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in self._entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+
+    def append(self, expr: str, result: str, angle_mode: str = "Rad") -> dict:
+        entry = {
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "expr": expr,
+            "result": result,
+            "angle_mode": angle_mode,
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            size = f.tell()
+        self._entries.append(entry)
+        if size > self.max_bytes:
+            # 덧붙이기만 하는 경우(GUI, --record)에도 파일 크기 상한을 지킨다. 아직 안 읽었으면 끝부분을 읽고 정리
+            if self._loaded:
+                self.compact()
+            else:
+                self._load()
+        return entry
+
+    def entries(self) -> list:
+        # 최신 기록이 앞에 오는 목록
+        self._load()
+        return list(reversed(self._entries))
+
+    def search(self, text: str) -> list:
+        # (recall에 쓰는 번호, 기록) 목록. 번호는 검색 전 전체 목록 기준
+        return [(i, e) for i, e in enumerate(self.entries()) if text in e["expr"] or text in e["result"]]
+
+    def recall(self, index: int = 0) -> dict:
+        # 0이 가장 최근 기록
+        return self.entries()[index]
+
+    def clear(self):
+        self._entries.clear()
+        self._loaded = True
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._entries)
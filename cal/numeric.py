@@ -0,0 +1,649 @@
+## codyssey part5 - 2 [numeric] ##
+## Mariner_정찬수 ##
+
+# 계산기 엔진과 수식 엔진이 쓰는 수 체계(backend).
+#   FloatNumeric    : 기본값. 지금까지와 같은 float + math (정밀도를 따로 지정하지 않으면 항상 이 경로)
+#   DecimalNumeric  : decimal.Decimal, 지정한 유효숫자(precision)까지 계산. 초월함수도 급수로 직접 계산
+#   FractionNumeric : fractions.Fraction, 사칙연산은 정확한 유리수. 무리수 결과만 Decimal로 근사해서 분수로 바꾼다
+# 모든 backend는 같은 메서드 이름을 가지며, 정의역 밖 입력은 ValueError / ZeroDivisionError를 낸다.
+
+import contextlib
+import decimal
+import math
+from decimal import Decimal
+from fractions import Fraction
+
+DEFAULT_PRECISION = 28
+GUARD_DIGITS = 5 # 중간 계산에서 반올림 오차가 결과 자리까지 번지지 않도록 더 쓰는 자릿수
+FLOAT_FACTORIAL_LIMIT = 170 # 171! 부터는 float 범위를 넘는다
+EXACT_FACTORIAL_LIMIT = 1000 # Decimal/Fraction에서 math.factorial로 정확히 계산하는 최대 n
+STIRLING_PRECISION = 30 # float 경로에서 큰 n!의 가수를 구할 때 쓰는 유효숫자
+EXACT_DISPLAY_DIGITS = 4000 # 분수 표시에서 분자/분모를 그대로 쓰는 최대 자릿수 (int -> str 변환 한도 4300 아래)
+
+
+class LargeFloat(float):
+    # float 범위를 넘는 결과. 화면 표시용 가수(mantissa)와 지수(exponent)를 따로 가지며 표시만 할 수 있다 (사칙연산은 OverflowError)
+    def __new__(cls, mantissa: float, exponent: int):
+        obj = super().__new__(cls, math.copysign(math.inf, mantissa))
+        obj.mantissa = mantissa
+        obj.exponent = exponent
+        return obj
+
+    @classmethod
+    def from_log10(cls, log10: Decimal, sign: int = 1):
+        exponent = int(log10.to_integral_value(rounding=decimal.ROUND_FLOOR))
+        with decimal.localcontext(prec=len(log10.as_tuple().digits) + 2):
+            fraction = log10 - exponent
+        with decimal.localcontext(prec=STIRLING_PRECISION):
+            mantissa = float(Decimal(10) ** fraction)
+        if round(mantissa, 14) >= 10:
+            mantissa, exponent = mantissa / 10, exponent + 1
+        return cls(sign * mantissa, exponent)
+
+    def format(self) -> str:
+        return f"{self.mantissa:.14f}e{self.exponent:+d}"
+
+    def __neg__(self):
+        return LargeFloat(-self.mantissa, self.exponent)
+
+    def __abs__(self):
+        return LargeFloat(abs(self.mantissa), self.exponent)
+
+    def __pos__(self):
+        return self
+
+    def _out_of_range(self, *args):
+        # inf로 계속 계산하면 171! ÷ 170! 같은 식이 inf/nan이 되므로, 이어지는 연산은 Error로 처리한다
+        raise OverflowError("result out of float range")
+
+    __add__ = __radd__ = __sub__ = __rsub__ = _out_of_range
+    __mul__ = __rmul__ = __truediv__ = __rtruediv__ = _out_of_range
+    __floordiv__ = __rfloordiv__ = __mod__ = __rmod__ = __pow__ = __rpow__ = _out_of_range
+
+
+def _in_range(x):
+    # float 범위 밖의 값(LargeFloat)은 math 함수에 inf로 넘어가므로 로그 외의 함수에서는 OverflowError
+    if isinstance(x, LargeFloat):
+        raise OverflowError("operand out of float range")
+    return x
+
+
+_BERNOULLI = [Fraction(1)] # B_0, B_1, B_2, ... (B_1 = -1/2)
+
+
+def _bernoulli(m: int) -> Fraction:
+    # B_m = -1/(m+1) * sum(C(m+1, k) * B_k, k < m). 필요한 만큼만 계산해서 캐시
+    while len(_BERNOULLI) <= m:
+        n = len(_BERNOULLI)
+        _BERNOULLI.append(-sum(math.comb(n + 1, k) * b for k, b in enumerate(_BERNOULLI)) / (n + 1))
+    return _BERNOULLI[m]
+
+
+def ln_gamma(z, prec: int) -> tuple:
+    # (ln|Gamma(z)|, 부호)를 계산. z가 작으면 Gamma(z) = Gamma(z+N) / z(z+1)...(z+N-1) 로
+    # 충분히 키운 뒤 Stirling 급수를 쓴다. n!을 직접 만들지 않으므로 100000! 도 급수 몇 항이면 끝난다.
+    # exp(ln)의 상대 오차가 prec 자리 안에 들도록 ln의 정수부 자릿수만큼 더 정밀하게 계산한다
+    z = Decimal(z)
+    prec += max(z.adjusted(), 0) + 2
+    with decimal.localcontext(prec=prec + GUARD_DIGITS, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN):
+        if z <= 0 and z == z.to_integral_value():
+            raise ValueError("math domain error")
+        product = Decimal(1)
+        while z < prec:
+            product *= z
+            z += 1
+        two_pi = 2 * DecimalNumeric._compute_pi(prec + GUARD_DIGITS)
+        result = (z - Decimal("0.5")) * z.ln() - z + two_pi.ln() / 2
+        eps = Decimal(10) ** -(prec + GUARD_DIGITS) * max(abs(result), 1)
+        power, z2, k = z, z * z, 1
+        while True:
+            b = _bernoulli(2 * k)
+            term = Decimal(b.numerator) / (b.denominator * 2 * k * (2 * k - 1)) / power
+            if abs(term) < eps:
+                break
+            result += term
+            power *= z2
+            k += 1
+        return result - abs(product).ln(), 1 if product > 0 else -1
+
+
+def _log10_gamma(z, prec: int) -> tuple:
+    ln, sign = ln_gamma(z, prec)
+    with decimal.localcontext(prec=len(ln.as_tuple().digits)):
+        return ln / Decimal(10).ln(), sign
+
+
+class FloatNumeric:
+    name = "float"
+    pi = math.pi
+    e = math.e
+
+    def context(self):
+        # 사칙연산(+, -, x, ÷)을 이 backend의 정밀도로 하기 위한 with 블록
+        return contextlib.nullcontext()
+
+    def number(self, text: str):
+        return float(text)
+
+    def parse(self, text: str):
+        # 화면에 가수/지수로 표시된 float 범위 밖의 값은 inf가 아니라 LargeFloat으로 되돌린다
+        value = float(text)
+        if math.isinf(value) and "e" in text.lower():
+            mantissa, _, exponent = text.lower().partition("e")
+            return LargeFloat(float(mantissa), int(exponent))
+        return value
+
+    def format(self, value) -> str:
+        if isinstance(value, LargeFloat):
+            return value.format()
+        fval = float(value)
+        if abs(fval) >= 1e14:
+            return f"{fval:.14e}"
+        elif abs(fval) < 1e-15:
+            return str(0)
+        else:
+            return f"{fval:.14g}"
+
+    def radians(self, x):
+        return math.radians(_in_range(x))
+
+    def degrees(self, x):
+        return math.degrees(_in_range(x))
+
+    def sin(self, x):
+        return math.sin(_in_range(x))
+
+    def cos(self, x):
+        return math.cos(_in_range(x))
+
+    def tan(self, x):
+        return math.tan(_in_range(x))
+
+    def sinh(self, x):
+        return math.sinh(_in_range(x))
+
+    def cosh(self, x):
+        return math.cosh(_in_range(x))
+
+    def tanh(self, x):
+        return math.tanh(_in_range(x))
+
+    def asin(self, x):
+        return math.asin(_in_range(x))
+
+    def acos(self, x):
+        return math.acos(_in_range(x))
+
+    def atan(self, x):
+        return math.atan(_in_range(x))
+
+    def asinh(self, x):
+        return math.asinh(_in_range(x))
+
+    def acosh(self, x):
+        return math.acosh(_in_range(x))
+
+    def atanh(self, x):
+        return math.atanh(_in_range(x))
+
+    def exp(self, x):
+        return math.exp(_in_range(x))
+
+    def ln(self, x):
+        if x <= 0:
+            raise ValueError("math domain error")
+        if isinstance(x, LargeFloat):
+            return self.log10(x) * math.log(10)
+        return math.log(x)
+
+    def log10(self, x):
+        if x <= 0:
+            raise ValueError("math domain error")
+        if isinstance(x, LargeFloat): # float 범위 밖의 값은 가수/지수로 계산 (log10(171!) = log10(1.241...) + 309)
+            return math.log10(x.mantissa) + x.exponent
+        return math.log10(x)
+
+    def log2(self, x):
+        if x <= 0:
+            raise ValueError("math domain error")
+        if isinstance(x, LargeFloat):
+            return self.log10(x) / math.log10(2)
+        return math.log2(x)
+
+    def sqrt(self, x):
+        return math.sqrt(_in_range(x))
+
+    def cbrt(self, x):
+        return x ** (1 / 3) if x >= 0 else -(-x) ** (1 / 3)
+
+    def root(self, x, n):
+        # x >= 0 의 n제곱근 (음수 처리는 호출하는 쪽 규칙을 따른다)
+        return x ** (1 / n)
+
+    def power(self, x, y):
+        # float의 음수 ** 정수가 아닌 수는 complex가 되므로 다른 backend처럼 domain error
+        if x < 0 and y != int(y):
+            raise ValueError("math domain error")
+        return x ** y
+
+    def factorial(self, x):
+        # 정수는 170! 까지 정확히, 그 이상은 Stirling 급수로 가수/지수만 계산한다.
+        # 정수가 아니면 x! = Gamma(x + 1) (음의 정수는 정의되지 않음)
+        if x == int(x):
+            n = int(x)
+            if n < 0:
+                raise ValueError("math domain error")
+            if n <= FLOAT_FACTORIAL_LIMIT:
+                return math.factorial(n)
+        try:
+            return math.gamma(x + 1)
+        except OverflowError:
+            return LargeFloat.from_log10(*_log10_gamma(Decimal(x) + 1, STIRLING_PRECISION))
+
+
+class DecimalNumeric(FloatNumeric):
+    name = "decimal"
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        self.precision = precision
+        self._pi = None
+
+    def _context(self, extra: int = GUARD_DIGITS):
+        # 큰 n! 도 표현할 수 있게 지수 범위는 최대로
+        return decimal.localcontext(prec=self.precision + extra, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+    def context(self):
+        return self._context(0)
+
+    def _round(self, value) -> Decimal:
+        with self.context():
+            return +value
+
+    def number(self, text: str):
+        return Decimal(text)
+
+    def parse(self, text: str):
+        try:
+            return Decimal(text)
+        except decimal.InvalidOperation:
+            raise ValueError(f"could not convert string to Decimal: {text!r}") from None
+
+    def format(self, value) -> str:
+        with self.context():
+            value = +Decimal(value)
+            if value.is_zero() or abs(value) < Decimal(10) ** -self.precision:
+                return str(0)
+            if abs(value) >= Decimal(10) ** self.precision:
+                return f"{value:.{self.precision - 1}e}"
+            return f"{value.normalize():f}"
+
+    @property
+    def pi(self) -> Decimal:
+        if self._pi is None:
+            self._pi = self._round(self._compute_pi(self.precision + GUARD_DIGITS))
+        return self._pi
+
+    @property
+    def e(self) -> Decimal:
+        return self.exp(Decimal(1))
+
+    @staticmethod
+    def _compute_pi(prec: int) -> Decimal:
+        # 급수 pi = 3 + 3*(1/24) + 3*(1/24)*(9/80) + ... (decimal 모듈 문서의 방법)
+        with decimal.localcontext(prec=prec + 2):
+            lasts, t, s, n, na, d, da = 0, Decimal(3), Decimal(3), 1, 0, 0, 24
+            while s != lasts:
+                lasts = s
+                n, na = n + na, na + 8
+                d, da = d + da, da + 32
+                t = (t * n) / d
+                s += t
+        return s
+
+    def degrees(self, x):
+        with self._context():
+            return self._round(Decimal(x) * 180 / self._compute_pi(self.precision + GUARD_DIGITS))
+
+    def radians(self, x):
+        # 결과 자리에서 반올림하지 않고 guard digit까지 남겨서 sin/cos(90도) 같은 값이 0으로 떨어지게 한다
+        with self._context():
+            return Decimal(x) * self._compute_pi(self.precision + GUARD_DIGITS) / 180
+
+    def _sin_cos(self, x) -> tuple:
+        # 2*pi 주기로 줄인 뒤 테일러 급수. 큰 x는 정수부 자릿수만큼 더 정밀하게 줄인다
+        x = Decimal(x)
+        extra = GUARD_DIGITS + max(x.adjusted(), 0)
+        with self._context(extra):
+            two_pi = 2 * self._compute_pi(self.precision + extra)
+            x = x.remainder_near(two_pi)
+            x2 = x * x
+            sin_s, cos_s = x, Decimal(1)
+            term_s, term_c, i = x, Decimal(1), 1
+            while True:
+                term_c = -term_c * x2 / (i * (i + 1))
+                term_s = -term_s * x2 / ((i + 1) * (i + 2))
+                i += 2
+                if cos_s + term_c == cos_s and sin_s + term_s == sin_s:
+                    break
+                cos_s += term_c
+                sin_s += term_s
+            return sin_s, cos_s
+
+    def sin(self, x):
+        return self._round(self._sin_cos(x)[0])
+
+    def cos(self, x):
+        return self._round(self._sin_cos(x)[1])
+
+    def tan(self, x):
+        s, c = self._sin_cos(x)
+        with self._context():
+            return self._round(s / c)
+
+    def sinh(self, x):
+        with self._context():
+            ex = Decimal(x).exp()
+            return self._round((ex - 1 / ex) / 2)
+
+    def cosh(self, x):
+        with self._context():
+            ex = Decimal(x).exp()
+            return self._round((ex + 1 / ex) / 2)
+
+    def tanh(self, x):
+        with self._context():
+            e2x = (2 * Decimal(x)).exp()
+            return self._round((e2x - 1) / (e2x + 1))
+
+    def _atan(self, x: Decimal) -> Decimal:
+        # atan(x) = 2 atan(x / (1 + sqrt(1 + x^2))) 로 |x|를 충분히 줄인 뒤 테일러 급수 (guard 정밀도 그대로 반환)
+        with self._context():
+            halvings = 0
+            while abs(x) > Decimal("0.1"):
+                x = x / (1 + (1 + x * x).sqrt())
+                halvings += 1
+            x2, term, total, k = x * x, x, x, 1
+            while True:
+                term = -term * x2
+                step = term / (2 * k + 1)
+                if total + step == total:
+                    break
+                total += step
+                k += 1
+            return total * 2 ** halvings
+
+    def atan(self, x):
+        return self._round(self._atan(Decimal(x)))
+
+    def asin(self, x):
+        x = Decimal(x)
+        if abs(x) > 1:
+            raise ValueError("math domain error")
+        with self._context():
+            if abs(x) == 1:
+                return self._round(x * self._compute_pi(self.precision + GUARD_DIGITS) / 2)
+            return self._round(self._atan(x / (1 - x * x).sqrt()))
+
+    def acos(self, x):
+        x = Decimal(x)
+        if abs(x) > 1:
+            raise ValueError("math domain error")
+        with self._context():
+            half_pi = self._compute_pi(self.precision + GUARD_DIGITS) / 2
+            if abs(x) == 1:
+                return self._round(half_pi - x * half_pi)
+            return self._round(half_pi - self._atan(x / (1 - x * x).sqrt()))
+
+    def asinh(self, x):
+        x = Decimal(x)
+        with self._context():
+            # 음수는 부호를 떼고 계산해야 ln 안에서 자릿수가 상쇄되지 않는다
+            value = (abs(x) + (x * x + 1).sqrt()).ln()
+            return self._round(value.copy_sign(x))
+
+    def acosh(self, x):
+        x = Decimal(x)
+        if x < 1:
+            raise ValueError("math domain error")
+        with self._context():
+            return self._round((x + (x * x - 1).sqrt()).ln())
+
+    def atanh(self, x):
+        x = Decimal(x)
+        if abs(x) >= 1:
+            raise ValueError("math domain error")
+        with self._context():
+            return self._round(((1 + x) / (1 - x)).ln() / 2)
+
+    def exp(self, x):
+        with self._context():
+            return self._round(Decimal(x).exp())
+
+    def ln(self, x):
+        if x <= 0:
+            raise ValueError("math domain error")
+        with self._context():
+            return self._round(Decimal(x).ln())
+
+    def log10(self, x):
+        if x <= 0:
+            raise ValueError("math domain error")
+        with self._context():
+            return self._round(Decimal(x).log10())
+
+    def log2(self, x):
+        if x <= 0:
+            raise ValueError("math domain error")
+        with self._context():
+            return self._round(Decimal(x).ln() / Decimal(2).ln())
+
+    def sqrt(self, x):
+        if x < 0:
+            raise ValueError("math domain error")
+        with self._context():
+            return self._round(Decimal(x).sqrt())
+
+    def root(self, x, n):
+        if x == 0:
+            return Decimal(0)
+        with self._context():
+            return self._round((Decimal(x).ln() / Decimal(n)).exp())
+
+    def cbrt(self, x):
+        return self.root(x, 3) if x >= 0 else -self.root(-x, 3)
+
+    def power(self, x, y):
+        with self._context():
+            return self._round(Decimal(x) ** Decimal(y))
+
+    def factorial(self, x):
+        x = Decimal(x)
+        if x == x.to_integral_value() and 0 <= x <= EXACT_FACTORIAL_LIMIT:
+            return self._round(Decimal(math.factorial(int(x))))
+        ln, sign = ln_gamma(x + 1, self.precision)
+        with self._context(GUARD_DIGITS + max(x.adjusted(), 0) + 2):
+            return self._round(sign * ln.exp())
+
+
+class FractionNumeric(FloatNumeric):
+    name = "fraction"
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        # 무리수 결과를 근사할 때 쓰는 유효숫자
+        self.approx = DecimalNumeric(precision)
+        self.precision = precision
+
+    def _approx(self, func, *args) -> Fraction:
+        value = getattr(self.approx, func)(*(self._decimal(a) for a in args))
+        # 근사 오차 수준의 값(cos 90도 등)은 0으로
+        return Fraction(0) if abs(value) < Decimal(10) ** -self.precision else Fraction(value)
+
+    def _decimal(self, value) -> Decimal:
+        if isinstance(value, Fraction):
+            with self.approx._context():
+                return Decimal(value.numerator) / Decimal(value.denominator)
+        return Decimal(value)
+
+    def context(self):
+        return contextlib.nullcontext()
+
+    def number(self, text: str):
+        return Fraction(text)
+
+    def parse(self, text: str):
+        return Fraction(text) # "1/3", "0.25", "1e3" 모두 허용
+
+    def format(self, value) -> str:
+        if isinstance(value, LargeFloat):
+            return value.format()
+        value = Fraction(value)
+        if max(value.numerator.bit_length(), value.denominator.bit_length()) * math.log10(2) > EXACT_DISPLAY_DIGITS:
+            # 너무 긴 정수는 str()로 바꿀 수 없으므로 가수/지수로 표시
+            num, den = abs(value.numerator), value.denominator
+            digits = max(len(str(num.bit_length())), 1) + STIRLING_PRECISION
+            with decimal.localcontext(prec=digits):
+                log10 = Decimal(num).log10() - Decimal(den).log10()
+            return LargeFloat.from_log10(log10, -1 if value < 0 else 1).format()
+        if value.denominator == 1:
+            return str(value.numerator)
+        return f"{value.numerator}/{value.denominator}"
+
+    @property
+    def pi(self) -> Fraction:
+        return Fraction(self.approx.pi)
+
+    @property
+    def e(self) -> Fraction:
+        return Fraction(self.approx.e)
+
+    def radians(self, x):
+        return self._approx("radians", x)
+
+    def degrees(self, x):
+        return self._approx("degrees", x)
+
+    def sin(self, x):
+        return Fraction(0) if x == 0 else self._approx("sin", x)
+
+    def cos(self, x):
+        return Fraction(1) if x == 0 else self._approx("cos", x)
+
+    def tan(self, x):
+        return Fraction(0) if x == 0 else self._approx("tan", x)
+
+    def sinh(self, x):
+        return self._approx("sinh", x)
+
+    def cosh(self, x):
+        return self._approx("cosh", x)
+
+    def tanh(self, x):
+        return self._approx("tanh", x)
+
+    def asin(self, x):
+        return Fraction(0) if x == 0 else self._approx("asin", x)
+
+    def acos(self, x):
+        return Fraction(0) if x == 1 else self._approx("acos", x)
+
+    def atan(self, x):
+        return Fraction(0) if x == 0 else self._approx("atan", x)
+
+    def asinh(self, x):
+        return Fraction(0) if x == 0 else self._approx("asinh", x)
+
+    def acosh(self, x):
+        return Fraction(0) if x == 1 else self._approx("acosh", x)
+
+    def atanh(self, x):
+        return Fraction(0) if x == 0 else self._approx("atanh", x)
+
+    def log2(self, x):
+        x = Fraction(x)
+        if x > 0:
+            # 2의 거듭제곱이면 정확한 정수
+            for value, sign in ((x, 1), (1 / x, -1)):
+                if value.denominator == 1 and value.numerator.bit_count() == 1:
+                    return Fraction(sign * (value.numerator.bit_length() - 1))
+        return self._approx("log2", x)
+
+    def exp(self, x):
+        return Fraction(1) if x == 0 else self._approx("exp", x)
+
+    def ln(self, x):
+        return Fraction(0) if x == 1 else self._approx("ln", x)
+
+    def log10(self, x):
+        if x > 0:
+            # 10의 거듭제곱이면 정확한 정수
+            for value, sign in ((x, 1), (1 / Fraction(x), -1)):
+                if value.denominator == 1 and value.numerator >= 1 and str(value.numerator).rstrip("0") == "1":
+                    return Fraction(sign * (len(str(value.numerator)) - 1))
+        return self._approx("log10", x)
+
+    @staticmethod
+    def _exact_root(x: Fraction, n: int) -> Fraction | None:
+        # 분자, 분모가 모두 정확히 n제곱수이면 정확한 유리수 근
+        roots = []
+        for part in (x.numerator, x.denominator):
+            try:
+                r = math.isqrt(part) if n == 2 else round(part ** (1 / n))
+            except OverflowError:
+                return None
+            for cand in (r - 1, r, r + 1):
+                if cand >= 0 and cand ** n == part:
+                    roots.append(cand)
+                    break
+            else:
+                return None
+        return Fraction(roots[0], roots[1])
+
+    def sqrt(self, x):
+        x = Fraction(x)
+        if x < 0:
+            raise ValueError("math domain error")
+        exact = self._exact_root(x, 2)
+        return exact if exact is not None else self._approx("sqrt", x)
+
+    def root(self, x, n):
+        x, n = Fraction(x), Fraction(n)
+        if n.denominator == 1 and n > 0:
+            exact = self._exact_root(x, n.numerator)
+            if exact is not None:
+                return exact
+        return self._approx("root", x, n)
+
+    def cbrt(self, x):
+        return self.root(x, 3) if x >= 0 else -self.root(-x, 3)
+
+    def power(self, x, y):
+        x, y = Fraction(x), Fraction(y)
+        if y.denominator == 1:
+            return x ** y.numerator
+        if x < 0:
+            raise ValueError("math domain error")
+        root = self.root(x, y.denominator)
+        return root ** y.numerator
+
+    def factorial(self, x):
+        x = Fraction(x)
+        if x.denominator == 1 and 0 <= x <= EXACT_FACTORIAL_LIMIT:
+            return Fraction(math.factorial(int(x)))
+        if x > EXACT_FACTORIAL_LIMIT:
+            # 분수로는 자릿수가 너무 커지므로 가수/지수 표시로 대신한다
+            return LargeFloat.from_log10(*_log10_gamma(self._decimal(x) + 1, self.precision))
+        return self._approx("factorial", x)
+
+
+FLOAT = FloatNumeric()
+
+
+def make_numeric(mode: str = "float", precision: int | None = None) -> FloatNumeric:
+    # mode: "float" | "decimal" | "fraction". 정밀도를 지정하지 않은 decimal은 float 경로를 그대로 쓴다
+    if mode == "fraction":
+        return FractionNumeric(precision or DEFAULT_PRECISION)
+    if mode == "decimal" and precision is not None:
+        return DecimalNumeric(precision)
+    if mode in ("float", "decimal"):
+        return FLOAT
+    raise ValueError(f"Unknown numeric mode: {mode}")
@@ -0,0 +1,257 @@
+## codyssey part5 - 2 [vectorized] ##
+## Mariner_정찬수 ##
+
+# 공학용 계산기 함수를 NumPy 배열 전체에 한 번에 적용하는 일괄 계산 API.
+# EngineeringEngine의 단항 연산(func_sin, natural_log, cube_root, factorial ...)과 같은 Deg/Rad 규칙을 쓰고,
+# 계산기에서 "Error"가 나오는 값은 NaN으로 두고 따로 True 마스크로 표시한다.
+# 수식은 expression.parse 트리를 ufunc 조합으로 바꿔서 계산하며, 대문자 한 글자(A~Z)를 배열 변수로 쓴다.
+#   python vectorized.py sweep.csv --column A=angle --expr "sin(A)^2 + 1" --deg --output out.csv
+#   python vectorized.py sweep.csv --column angle --op func_sin --deg
+
+import argparse
+import csv
+import functools
+import math
+
+import numpy as np
+
+import expression
+
+# float 범위 안의 정수 계승 0! ~ 170! (171! 부터는 float 범위를 넘는다)
+_FACTORIALS = np.array([float(math.factorial(n)) for n in range(171)])
+
+
+def _angle(x, angle_mode: str):
+    return np.radians(x) if angle_mode == "Deg" else x
+
+
+# Lanczos 근사 계수 (g=7, 9항). float64에서 상대 오차 약 1e-15 ~ 1e-13 (큰 x일수록 커짐)
+_LANCZOS_G = 7
+_LANCZOS = np.array([
+    0.99999999999980993, 676.5203681218851, -1259.1392167224028, 771.32342877765313,
+    -176.61502916214059, 12.507343278686905, -0.13857109526572012, 9.9843695780195716e-6,
+    1.5056327351493116e-7,
+])
+
+
+def _gamma(z):
+    # 원소별 math.gamma 대신 배열 전체에 Lanczos 근사를 적용. 0.5 미만은 반사 공식 Gamma(z)Gamma(1-z) = pi / sin(pi z)
+    z = np.asarray(z, dtype=np.float64)
+    reflect = z < 0.5
+    w = np.where(reflect, 1 - z, z) - 1
+    series = _LANCZOS[0] + np.sum(_LANCZOS[1:] / (w[..., None] + np.arange(1, len(_LANCZOS))), axis=-1)
+    t = w + _LANCZOS_G + 0.5
+    half = t ** ((w + 0.5) / 2) # t^(w+0.5)를 한 번에 만들면 170 근처에서 먼저 넘치므로 반씩 곱한다
+    g = np.sqrt(2 * np.pi) * (half * np.exp(-t)) * half * series
+    return np.where(reflect, np.pi / (np.sin(np.pi * z) * g), g)
+
+
+def _factorial(x):
+    # numeric.FloatNumeric.factorial과 같은 규칙: 정수는 표에서 찾고, 정수가 아니면 Gamma(x + 1),
+    # 음의 정수는 Error.
+    # 결과가 float 범위를 넘는 경우(171! 이상 등)는 배열에 담을 수 없으므로 inf -> Error로 표시한다
+    # (엔진의 스칼라 경로는 LargeFloat으로 가수/지수를 보여주지만 배열 경로는 그렇게 하지 않는다)
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    integer = np.trunc(x) == x
+    ok = integer & (x >= 0) & (x < len(_FACTORIALS))
+    out[ok] = _FACTORIALS[x[ok].astype(np.int64)]
+    out[integer & (x >= len(_FACTORIALS))] = np.inf
+    frac = ~integer & np.isfinite(x)
+    out[frac] = _gamma(x[frac] + 1)
+    return out
+
+
+def _from_angle(x, angle_mode: str):
+    return np.degrees(x) if angle_mode == "Deg" else x
+
+
+def _domain(values, valid):
+    return np.where(valid, values, np.nan)
+
+
+def _y_root(x, y):
+    # EngineeringEngine.y_root와 같은 규칙 (음수는 홀수 차수 근만 허용)
+    odd = (np.trunc(y) == y) & (np.mod(y, 2) == 1)
+    inv = 1 / np.where(y == 0, np.nan, y)
+    return np.where(x >= 0, np.abs(x) ** inv, _domain(-(np.abs(x) ** inv), odd))
+
+
+# 이름 -> (x, angle_mode) 를 받는 배열 함수. 이름은 EngineeringEngine 메서드와 같다
+OPERATIONS = {
+    "func_sin": lambda x, a: np.sin(_angle(x, a)),
+    "func_cos": lambda x, a: np.cos(_angle(x, a)),
+    "func_tan": lambda x, a: np.tan(_angle(x, a)),
+    "func_sinh": lambda x, a: np.sinh(x),
+    "func_cosh": lambda x, a: np.cosh(x),
+    "func_tanh": lambda x, a: np.tanh(x),
+    "square": lambda x, a: x * x,
+    "cube": lambda x, a: x * x * x,
+    "inverse": lambda x, a: _domain(1 / np.where(x == 0, np.nan, x), x != 0),
+    "square_root": lambda x, a: _domain(np.sqrt(np.abs(x)), x >= 0),
+    "cube_root": lambda x, a: np.cbrt(x),
+    "natural_log": lambda x, a: _domain(np.log(np.where(x > 0, x, np.nan)), x > 0),
+    "log_base_10": lambda x, a: _domain(np.log10(np.where(x > 0, x, np.nan)), x > 0),
+    "factorial": lambda x, a: _factorial(x),
+    "percent": lambda x, a: x / 100.0,
+    "func_exp": lambda x, a: np.exp(x),
+    "func_10x": lambda x, a: np.power(10.0, x),
+    "func_2x": lambda x, a: np.exp2(x),
+    "log_base_2": lambda x, a: _domain(np.log2(np.where(x > 0, x, np.nan)), x > 0),
+    "func_asin": lambda x, a: _from_angle(np.arcsin(x), a),
+    "func_acos": lambda x, a: _from_angle(np.arccos(x), a),
+    "func_atan": lambda x, a: _from_angle(np.arctan(x), a),
+    "func_asinh": lambda x, a: np.arcsinh(x),
+    "func_acosh": lambda x, a: np.arccosh(x),
+    "func_atanh": lambda x, a: np.arctanh(x),
+}
+
+_FUNCS = {
+    "sin": OPERATIONS["func_sin"], "cos": OPERATIONS["func_cos"], "tan": OPERATIONS["func_tan"],
+    "sinh": OPERATIONS["func_sinh"], "cosh": OPERATIONS["func_cosh"], "tanh": OPERATIONS["func_tanh"],
+    "ln": OPERATIONS["natural_log"], "log": OPERATIONS["log_base_10"], "sqrt": OPERATIONS["square_root"],
+    "cbrt": OPERATIONS["cube_root"], "inv": OPERATIONS["inverse"], "fact": OPERATIONS["factorial"],
+    "exp": lambda x, a: np.exp(x), "abs": lambda x, a: np.abs(x),
+}
+_BINARY = {
+    "+": np.add, "-": np.subtract, "x": np.multiply,
+    "÷": lambda l, r: _domain(l / np.where(r == 0, np.nan, r), r != 0),
+    "^": np.power, "yroot": _y_root,
+}
+_POSTFIX = {"!": _factorial, "²": lambda x: x * x, "³": lambda x: x * x * x}
+
+
+def _finish(values):
+    # 계산기에서 Error 또는 표시할 수 없는 값(nan, inf)은 NaN + 마스크로 통일
+    values = np.asarray(values, dtype=np.float64)
+    mask = ~np.isfinite(values)
+    values = np.where(mask, np.nan, values)
+    return values, mask
+
+
+def apply(name: str, values, angle_mode: str = "Rad") -> tuple:
+    # 단항 연산 하나를 배열 전체에 적용해서 (결과, Error 마스크) 반환
+    if name not in OPERATIONS:
+        raise KeyError(f"Unknown operation: {name} (choose from {', '.join(OPERATIONS)})")
+    x = np.asarray(values, dtype=np.float64)
+    with np.errstate(all="ignore"):
+        return _finish(OPERATIONS[name](x, angle_mode))
+
+
+def _compile_node(node):
+    # 트리를 (변수 dict, angle_mode) -> 배열 함수로 변환
+    kind = node[0]
+    if kind == "num":
+        value = np.float64(node[1])
+        return lambda env, angle_mode: value
+    if kind == "const":
+        value = np.float64(math.pi if node[1] == "pi" else math.e)
+        return lambda env, angle_mode: value
+    if kind == "var":
+        name = node[1]
+        def _var(env, angle_mode):
+            if name not in env:
+                raise expression.ExpressionError(f"Variable {name!r} is not bound")
+            return env[name]
+        return _var
+    if kind == "neg":
+        operand = _compile_node(node[1])
+        return lambda env, angle_mode: -operand(env, angle_mode)
+    if kind == "bin":
+        func = _BINARY[node[1]]
+        left, right = _compile_node(node[2]), _compile_node(node[3])
+        return lambda env, angle_mode: func(left(env, angle_mode), right(env, angle_mode))
+    if kind == "post":
+        func = _POSTFIX[node[1]]
+        operand = _compile_node(node[2])
+        return lambda env, angle_mode: func(np.asarray(operand(env, angle_mode), dtype=np.float64))
+    if kind == "func":
+        func = _FUNCS[node[1]]
+        operand = _compile_node(node[2])
+        return lambda env, angle_mode: func(operand(env, angle_mode), angle_mode)
+    raise expression.ExpressionError(f"Unknown node {kind}")
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_normalized(normalized: str):
+    return _compile_node(expression._Parser(normalized.split(" ") if normalized else []).parse())
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_array_expression(expr: str):
+    # expression.compile_expression과 같이 원래 문자열, 정규화한 문자열 두 단계로 캐시
+    return _compile_normalized(expression.normalize(expr))
+
+
+def evaluate_array(expr: str, angle_mode: str = "Rad", **arrays) -> tuple:
+    # 수식을 변수 배열(A=..., B=...)에 대해 한 번에 계산해서 (결과, Error 마스크) 반환
+    env = {name: np.asarray(values, dtype=np.float64) for name, values in arrays.items()}
+    func = compile_array_expression(expr)
+    with np.errstate(all="ignore"):
+        values = func(env, angle_mode)
+    shape = np.broadcast_shapes(*(v.shape for v in env.values())) if env else ()
+    return _finish(np.broadcast_to(values, shape))
+
+
+def read_column(path: str, column: str):
+    # CSV 열 하나를 float 배열로 읽는다 (숫자가 아닌 칸은 NaN)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        if column not in (reader.fieldnames or []):
+            raise KeyError(f"Column {column!r} not found in {path}")
+        rows = [row[column] for row in reader]
+    out = np.full(len(rows), np.nan)
+    for i, text in enumerate(rows):
+        try:
+            out[i] = float(text)
+        except (TypeError, ValueError):
+            pass
+    return out
+
+
+def apply_csv(path: str, columns: dict, op: str | None = None, expr: str | None = None,
+              angle_mode: str = "Rad", output: str | None = None) -> tuple:
+    # columns: {변수 이름: CSV 열 이름}. op이면 첫 번째 열에 단항 연산, expr이면 수식을 계산
+    arrays = {name: read_column(path, col) for name, col in columns.items()}
+    if expr is not None:
+        values, mask = evaluate_array(expr, angle_mode, **arrays)
+    else:
+        values, mask = apply(op, next(iter(arrays.values())), angle_mode)
+
+    if output:
+        with open(path, "r", encoding="utf-8", newline="") as fin, \
+             open(output, "w", encoding="utf-8", newline="") as fout:
+            reader = csv.reader(fin)
+            writer = csv.writer(fout)
+            writer.writerow(next(reader) + ["result", "error"])
+            for row, value, err in zip(reader, values.tolist(), mask.tolist()):
+                writer.writerow(row + ["Error" if err else f"{value:.14g}", int(err)])
+    return values, mask
+
+
+def main():
+    parser = argparse.ArgumentParser(description="apply calculator functions to a CSV column")
+    parser.add_argument("csv", help="input CSV file with a header row")
+    parser.add_argument("--column", action="append", required=True,
+                        help="column to read, optionally bound to a variable (A=angle). repeatable")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--op", choices=sorted(OPERATIONS), help="unary operation to apply to the first column")
+    group.add_argument("--expr", help="expression over the bound variables, e.g. \"sin(A) x B\"")
+    parser.add_argument("--deg", action="store_true", help="use degrees for sin/cos/tan")
+    parser.add_argument("--output", help="write the input rows plus result/error columns here")
+    args = parser.parse_args()
+
+    columns = {}
+    for i, spec in enumerate(args.column):
+        name, _, col = spec.rpartition("=")
+        columns[name or chr(ord("A") + i)] = col
+
+    values, mask = apply_csv(args.csv, columns, args.op, args.expr, "Deg" if args.deg else "Rad", args.output)
+    print(f"[vectorized] {len(values)} rows, {int(mask.sum())} errors")
+    if not args.output:
+        for value, err in zip(values.tolist(), mask.tolist()):
+            print("Error" if err else f"{value:.14g}")
+
+
+if __name__ == "__main__":
+    main()
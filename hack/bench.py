@@ -0,0 +1,186 @@
+## codyssey part5 - 1 [bench] ##
+## Mariner_정찬수 ##
+
+# door_hacking 크래커 벤치마크.
+# 비밀번호를 알고 있는 ZipCrypto 아카이브를 임시 폴더에 만들어서 (외부 파일 없음)
+# 단계별 처리량(후보 생성, 헤더 검사, 전체 검증)과 프로세스 수별 해독 시간을 측정하고 JSON으로 저장한다.
+#   python bench.py --length 4 --position 0.5 --max-procs 4 --output bench.json --compare old.json
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import tempfile
+import time
+import zipfile
+import zlib
+
+import door_hacking
+from keyspace import Keyspace, Odometer, parse_charset
+from zipcrypto import ZipCryptoChecker, write_encrypted_zip
+
+SECRET = b"codyssey part5 benchmark payload\n" * 8
+CHUNKS_PER_PROC = 16 # 프로세스 수별 비교에서 워커마다 돌아가는 구간 수 (door_hacking.CHUNK 대신)
+
+
+def throughput(func, seconds: float) -> float:
+    # func()가 한 번에 처리한 개수를 반환하도록 하고, seconds 동안 반복해서 초당 개수를 계산
+    count = 0
+    start = time.perf_counter()
+    while (lapsed := time.perf_counter() - start) < seconds:
+        count += func()
+    return count / lapsed
+
+
+def make_gen_code(alphabets):
+    # door_hacking.gen_code와 같은 divmod 방식이지만 벤치마크 키스페이스의 자리별 문자셋/길이를 쓴다
+    bases = [len(a) for a in alphabets]
+    def gen_code(x: int) -> bytes:
+        code = bytearray(len(alphabets))
+        for pos in range(len(alphabets) - 1, -1, -1):
+            x, r = divmod(x, bases[pos])
+            code[pos] = alphabets[pos][r]
+        return bytes(code)
+    return gen_code
+
+
+def bench_stages(zip_path: str, keyspace: Keyspace, password: bytes, seconds: float, use_numpy: bool) -> dict:
+    alphabets = keyspace.segments[-1]
+    checker = ZipCryptoChecker(zip_path)
+    results = {}
+    gen_code = make_gen_code(alphabets) # enum_odometer와 같은 문자셋/길이로 비교
+
+    def gen_code_batch():
+        for i in range(4096):
+            gen_code(i)
+        return 4096
+    results["enum_gen_code"] = throughput(gen_code_batch, seconds)
+
+    odo = Odometer(alphabets)
+    def odometer_batch():
+        for _ in range(4096):
+            odo.step()
+        return 4096
+    results["enum_odometer"] = throughput(odometer_batch, seconds)
+
+    codes = [gen_code(i) for i in range(4096)]
+    def header_check_batch():
+        for code in codes:
+            checker.check(code)
+        return len(codes)
+    results["header_check"] = throughput(header_check_batch, seconds)
+
+    scan_odo = Odometer(alphabets)
+    def scan_batch():
+        checker.scan(scan_odo, 4096)
+        return 4096
+    results["header_scan_prefix_cache"] = throughput(scan_batch, seconds)
+
+    if use_numpy: # numpy는 이 단계에서만 필요
+        from zipcrypto_np import candidates, header_check
+        cands = candidates(alphabets, 0, door_hacking.NP_BATCH)
+        def numpy_batch():
+            header_check(checker, cands)
+            return len(cands)
+        results["header_check_numpy"] = throughput(numpy_batch, seconds)
+
+    def full_verify():
+        checker.verify(password)
+        return 1
+    results["full_verify"] = throughput(full_verify, seconds)
+
+    # 기존 방식: 후보마다 zf.read()로 거절되기까지 걸리는 시간
+    with zipfile.ZipFile(zip_path) as zf:
+        name = zf.namelist()[0]
+        def zf_read():
+            try:
+                zf.read(name, pwd=codes[0])
+            except (RuntimeError, zipfile.BadZipFile, zlib.error):
+                pass
+            return 1
+        results["zf_read_reject"] = throughput(zf_read, seconds)
+    return results
+
+
+def bench_end_to_end(zip_path: str, keyspace: Keyspace, max_procs: int, use_numpy: bool) -> dict:
+    # 1..max_procs 프로세스로 처음부터 비밀번호를 찾을 때까지 걸린 시간
+    # door_hacking.CHUNK(100만)는 작은 벤치마크 키스페이스를 몇 구간으로밖에 못 나누므로 프로세스 수에 맞춰 줄인다
+    results = {}
+    for procs in range(1, max_procs + 1):
+        start = time.perf_counter()
+        chunk_size = max(1, keyspace.total // (procs * CHUNKS_PER_PROC))
+        found = door_hacking.unlock_zip_main(keyspace, use_numpy=use_numpy, procs=procs, chunk_size=chunk_size,
+                                             zip_path=zip_path)
+        results[str(procs)] = {"seconds": time.perf_counter() - start, "found": found}
+        print(f"\n  procs={procs}: {results[str(procs)]['seconds']:.2f}s found={found}")
+    return results
+
+
+def compare(current: dict, baseline_path: str):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n[compare] vs {baseline_path}")
+    for name, rate in current["stages"].items():
+        old = baseline.get("stages", {}).get(name)
+        if old:
+            print(f"  {name:26s} {old:14,.0f} -> {rate:14,.0f} /s  ({rate / old:.2f}x)")
+    for procs, run in current["end_to_end"].items():
+        old = baseline.get("end_to_end", {}).get(procs)
+        if old:
+            print(f"  procs={procs:<20s} {old['seconds']:13.2f}s -> {run['seconds']:13.2f}s   ({old['seconds'] / run['seconds']:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="door_hacking benchmark")
+    parser.add_argument("--charset", default="?l?d", help="keyspace charset (default: ?l?d)")
+    parser.add_argument("--length", type=int, default=4, help="password length of the synthetic archive (default: 4)")
+    parser.add_argument("--position", type=float, default=0.5, help="where the password sits in the keyspace, 0.0-1.0")
+    parser.add_argument("--max-procs", type=int, default=door_hacking.PROCS, help="measure time-to-crack for 1..N procs")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time spent on each stage measurement")
+    parser.add_argument("--numpy", action="store_true", help="also measure the NumPy batch checker")
+    parser.add_argument("--output", default="bench.json", help="where to save the results")
+    parser.add_argument("--compare", help="previous result JSON to compare against")
+    args = parser.parse_args()
+
+    keyspace = Keyspace.from_charset(parse_charset(args.charset), args.length, args.length)
+    index = min(int(keyspace.total * args.position), keyspace.total - 1)
+    password = keyspace.candidate(index)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        zip_path = os.path.join(tmp, "bench.zip")
+        write_encrypted_zip(zip_path, "secret.txt", SECRET, password)
+        print(f"[bench] keyspace={keyspace.total} password index={index}")
+
+        print("[bench] stages")
+        stages = bench_stages(zip_path, keyspace, password, args.seconds, args.numpy)
+        for name, rate in stages.items():
+            print(f"  {name:26s} {rate:14,.0f} /s")
+
+        print("[bench] end to end")
+        cwd = os.getcwd()
+        os.chdir(tmp) # 찾은 파일은 임시 폴더에 풀린다
+        try:
+            end_to_end = bench_end_to_end(zip_path, keyspace, args.max_procs, args.numpy)
+        finally:
+            os.chdir(cwd)
+
+    result = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "params": {"charset": args.charset, "length": args.length, "position": args.position,
+                   "index": index, "numpy": args.numpy},
+        "stages": stages,
+        "end_to_end": end_to_end,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"[bench] saved to {args.output}")
+
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+## codyssey part5 - 1 [checkpoint] ##
+## Mariner_정찬수 ##
+
+# 몇 시간씩 걸리는 탐색을 중간에 멈췄다가 이어서 할 수 있도록
+# 끝난 인덱스 구간을 ZIPFILE 옆의 작은 JSON 파일에 저장한다.
+
+import bisect
+import json
+import math
+import os
+
+
+def state_path(zip_path: str) -> str:
+    return zip_path + ".state"
+
+
+def merge_ranges(ranges) -> list:
+    # [lo, hi) 구간들을 정렬해서 겹치거나 맞닿은 구간은 하나로 합친다
+    merged = []
+    for lo, hi in sorted(map(tuple, ranges)):
+        if merged and lo <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    return merged
+
+
+def next_range(pos: int, done: list, total: int, chunk: int) -> tuple | None:
+    # pos부터 끝난 구간(merge_ranges 결과)을 건너뛰고 다음 [lo, hi) 구간을 반환. 남은 구간이 없으면 None
+    # 끝난 구간 목록만 들고 있으므로 메모리는 키스페이스 크기와 상관없이 끝난 구간 수에 비례한다
+    i = bisect.bisect_right(done, [pos, math.inf])
+    if i and pos < done[i - 1][1]:
+        pos = done[i - 1][1]
+    if pos >= total:
+        return None
+    end = min(pos + chunk, total)
+    if i < len(done):
+        end = min(end, done[i][0])
+    return pos, end
+
+
+def remaining(done: list, total: int) -> int:
+    return total - sum(max(0, min(hi, total) - lo) for lo, hi in done)
+
+
+def load(path: str, meta: dict) -> list:
+    # 저장된 키스페이스 정보가 지금과 다르면 이어서 할 수 없으므로 빈 목록 반환
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if state.get("meta") != meta:
+        print(f"[checkpoint] {path} does not match the current keyspace. Starting over.")
+        return []
+    return merge_ranges(state.get("done", []))
+
+
+def save(path: str, meta: dict, done) -> None:
+    # 임시 파일에 쓰고 교체해서 저장 도중 중단돼도 이전 상태 파일이 깨지지 않게 한다
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "done": merge_ranges(done)}, f)
+    os.replace(tmp, path)
@@ -0,0 +1,165 @@
+## codyssey part5 - 1 [classical] ##
+## Mariner_정찬수 ##
+
+# 고전 암호(카이사르) 해독 도우미.
+# 26개 shift별 변환표(str.maketrans)를 한 번만 만들어두고 str.translate로 O(n)에 해독한다.
+# 어떤 shift가 정답인지는 영어 글자 빈도와의 카이제곱(chi-squared) 값이 가장 작은 것으로 고른다.
+# shift를 바꾸면 글자 빈도표가 한 칸씩 회전할 뿐이라, 암호문 빈도를 한 번만 세면 26개 점수를 모두 계산할 수 있다.
+
+import string
+
+LOWER = string.ascii_lowercase
+UPPER = string.ascii_uppercase
+
+# 영어 글자 빈도 (a~z, 합계 1)
+ENGLISH_FREQ = [
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015, 0.06094, 0.06966,
+    0.00153, 0.00772, 0.04025, 0.02406, 0.06749, 0.07507, 0.01929, 0.00095, 0.05987,
+    0.06327, 0.09056, 0.02758, 0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+]
+
+
+def _shift_table(shift: int) -> dict:
+    # 암호문 글자를 shift만큼 뒤로 되돌리는 변환표 (대소문자 유지, 나머지 문자는 그대로)
+    return str.maketrans(
+        LOWER + UPPER,
+        LOWER[-shift:] + LOWER[:-shift] + UPPER[-shift:] + UPPER[:-shift] if shift else LOWER + UPPER,
+    )
+
+
+SHIFT_TABLES = [_shift_table(shift) for shift in range(26)]
+
+
+def caesar_decode(text: str, shift: int) -> str:
+    return text.translate(SHIFT_TABLES[shift % 26])
+
+
+def letter_counts(text: str) -> list:
+    lowered = text.lower()
+    return [lowered.count(ch) for ch in LOWER]
+
+
+def chi_squared(counts: list, shift: int) -> float:
+    # shift로 해독했을 때 평문 글자 i는 암호문 글자 (i + shift) 이므로 빈도표만 회전해서 비교
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    score = 0.0
+    for i, freq in enumerate(ENGLISH_FREQ):
+        expected = total * freq
+        observed = counts[(i + shift) % 26]
+        score += (observed - expected) ** 2 / expected
+    return score
+
+
+def rank_shifts(text: str) -> list:
+    # (점수, shift) 목록. 점수가 낮을수록 영어에 가깝다
+    counts = letter_counts(text)
+    return sorted((chi_squared(counts, shift), shift) for shift in range(26))
+
+
+def best_shift(text: str) -> int:
+    return rank_shifts(text)[0][1]
+
+
+# ---------- 대용량 파일 스트리밍 해독 ----------
+# 바이트 단위 변환표. UTF-8의 멀티바이트 문자는 0x80 이상 바이트로만 이루어져 있어서
+# ASCII 영문자만 바꾸는 변환은 청크 경계가 문자 중간에 걸려도 안전하다.
+BYTE_SHIFT_TABLES = [
+    bytes.maketrans((LOWER + UPPER).encode(), caesar_decode(LOWER + UPPER, shift).encode())
+    for shift in range(26)
+]
+
+
+def detect_shift(path: str, sample_size: int) -> int:
+    # 파일 앞부분 sample_size 바이트만 읽어서 shift 추정
+    with open(path, "rb") as f:
+        sample = f.read(sample_size).decode("utf-8", errors="ignore")
+    return best_shift(sample)
+
+
+def decode_chunk(task: tuple) -> int:
+    # (원본, 결과, 시작 위치, 크기, shift) 구간 하나를 해독해서 결과 파일의 같은 위치에 쓴다
+    src, dst, offset, size, shift = task
+    with open(src, "rb") as fin, open(dst, "r+b") as fout:
+        fin.seek(offset)
+        fout.seek(offset)
+        fout.write(fin.read(size).translate(BYTE_SHIFT_TABLES[shift % 26]))
+    return size
+
+
+# ---------- 비즈네르(Vigenère) ----------
+# 키 길이 L을 알면 암호문 글자를 L개 열로 나눴을 때 각 열은 카이사르 암호와 같다.
+# 1) 열별 일치 지수(index of coincidence)가 무작위(약 0.038)보다 영어(약 0.067) 쪽으로 높은 L을 찾고
+# 2) 열마다 위의 chi-squared로 shift를 골라 키를 복원한다.
+# 키를 전부 대입하는 방식(26^L)과 달리 암호문 길이에 거의 비례하는 시간이 든다.
+# 글자 빈도 계산은 numpy로 한 번에 처리하므로 numpy는 이 기능에서만 import 한다.
+IOC_RATIO = 0.85
+
+
+def _letters(text: str):
+    import numpy as np
+
+    codes = np.frombuffer(text.lower().encode("utf-32-le"), dtype=np.uint32)
+    return (codes[(codes >= ord("a")) & (codes <= ord("z"))] - ord("a")).astype(np.int64)
+
+
+def _column_counts(letters, length: int):
+    # (length, 26) 열별 글자 수. 열 번호 * 26 + 글자 로 한 번의 bincount
+    import numpy as np
+
+    idx = (np.arange(len(letters)) % length) * 26 + letters
+    return np.bincount(idx, minlength=length * 26).reshape(length, 26)
+
+
+def key_length_scores(text: str, max_len: int = 20) -> list:
+    # (평균 일치 지수, 키 길이) 목록. 진짜 키 길이의 배수도 똑같이 높게 나오므로
+    # 최고 점수의 IOC_RATIO 이상인 길이는 짧은 것부터, 나머지는 점수 순으로 정렬한다
+    letters = _letters(text)
+    scores = []
+    for length in range(1, min(max_len, max(len(letters) // 2, 1)) + 1):
+        counts = _column_counts(letters, length)
+        n = counts.sum(axis=1)
+        valid = n > 1
+        ioc = (counts * (counts - 1)).sum(axis=1)[valid] / (n[valid] * (n[valid] - 1))
+        scores.append((float(ioc.mean()) if len(ioc) else 0.0, length))
+    best = max((ioc for ioc, _ in scores), default=0.0)
+    cut = IOC_RATIO * best
+    return sorted(scores, key=lambda s: (s[0] < cut, s[1] if s[0] >= cut else -s[0]))
+
+
+def _shortest_period(key: str) -> str:
+    # "abcabc" -> "abc" (키 길이의 배수로 풀면 같은 키가 반복되어 나온다)
+    for size in range(1, len(key) + 1):
+        if len(key) % size == 0 and key[:size] * (len(key) // size) == key:
+            return key[:size]
+    return key
+
+
+def vigenere_decode(text: str, key: str) -> str:
+    # 영문자에만 키를 순서대로 적용 (다른 문자는 그대로 두고 키 위치도 넘기지 않음)
+    import numpy as np
+
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    lower = (codes >= ord("a")) & (codes <= ord("z"))
+    upper = (codes >= ord("A")) & (codes <= ord("Z"))
+    letters = lower | upper
+    shifts = np.array([ord(k) - ord("a") for k in key.lower()], dtype=np.int64)
+    base = np.where(upper, ord("A"), ord("a"))
+    key_stream = shifts[np.arange(int(letters.sum())) % len(shifts)]
+    out = codes.copy()
+    out[letters] = (codes[letters] - base[letters] - key_stream) % 26 + base[letters]
+    return out.astype(np.uint32).tobytes().decode("utf-32-le")
+
+
+def vigenere_solve(text: str, max_len: int = 20, top: int = 5) -> list:
+    # key_length_scores 상위 top개 길이로 키를 복원해서 (일치 지수, 키, 평문) 목록을 그 순서대로 반환
+    letters = _letters(text)
+    results = {}
+    for ioc, length in key_length_scores(text, max_len)[:top]:
+        counts = _column_counts(letters, length).tolist()
+        key = "".join(LOWER[min(range(26), key=lambda s: chi_squared(col, s))] for col in counts)
+        key = _shortest_period(key)
+        if key not in results:
+            results[key] = (ioc, key, vigenere_decode(text, key))
+    return list(results.values())
@@ -2,22 +2,38 @@
 ## Mariner_정찬수 ##
 
 import os
+import glob
+import argparse
+import queue
 import zipfile
 import zlib
 import string
 import time
 import datetime
+import threading
 from multiprocessing import Process, Lock
 import multiprocessing as mp
+from zipcrypto import ZipCryptoChecker
+from zipaes import AesChecker, is_aes
+from keyspace import Keyspace, parse_charset
+from wordlist import Wordlist, RULES
+from classical import caesar_decode, rank_shifts, detect_shift, decode_chunk, vigenere_solve
+import checkpoint
 
 ZIPFILE = "emergency_storage_key.zip"
 ALPHABET_DIGIT = (string.ascii_lowercase + string.digits).encode('utf-8') # 자리수 36개
 LENGTH = 6
-N = 36 ** LENGTH
-PROCS = 6
-STOP = mp.Event()
-
-_cnt = 0
+KEYSPACE = Keyspace.from_charset(ALPHABET_DIGIT, LENGTH, LENGTH) # 기본 키스페이스, zip 옵션으로 변경 가능
+PROCS = os.cpu_count() or 1 # 기본값: 사용 가능한 모든 코어
+CHUNK = 1_000_000 # 워커가 한 번에 가져가는 인덱스 구간 크기
+BATCH = 4096 # 한 번에 검사하는 후보 수 (이 단위로 STOP 확인, 카운터 반영)
+NP_BATCH = 65536 # NumPy 배치 모드에서 한 번에 배열로 만드는 후보 수
+AES_BATCH = 256 # AES는 후보마다 PBKDF2(1000회)라 느리므로 작은 단위로 STOP 확인
+DECODE_CHUNK = 4 * 1024 * 1024 # 카이사르 일괄 해독에서 워커가 한 번에 읽는 크기
+DECODE_SAMPLE = 64 * 1024 # shift 추정에 쓰는 파일 앞부분 크기
+RESULT_SUFFIX = ".result" # 일괄 해독 결과 파일: name.txt -> name.result.txt
+REPORT_INTERVAL = 0.25 # 진행상황 출력 주기(초)
+CHECKPOINT_INTERVAL = 30 # 끝난 구간을 상태 파일에 저장하는 주기(초)
 
 def gen_code(x: int) -> bytes:
     base = len(ALPHABET_DIGIT)
@@ -29,16 +45,42 @@ def gen_code(x: int) -> bytes:
 
     return bytes(code)
 
-def unlock_zip(pid, lock):
-    global _cnt
+def next_chunk(cursor, done: list, total: int, chunk_size: int = CHUNK) -> tuple | None:
+    # 공유 커서에서 다음 구간을 가져간다 (이미 끝난 구간은 건너뜀). 구간 단위로만 lock을 잡으므로 경합이 거의 없다.
+    with cursor.get_lock():
+        chunk = checkpoint.next_range(cursor.value, done, total, chunk_size)
+        if chunk is None:
+            return None
+        cursor.value = chunk[1]
+    return chunk
+
+def make_report(counters, pid, stop):
+    # source.scan()이 batch를 끝낼 때마다 부르는 콜백. 자기 슬롯에만 쓰므로 lock 불필요, 출력은 reporter가 담당
+    def report(n):
+        counters[pid] += n
+        if stop.is_set():
+            os._exit(1)
+    return report
 
+def open_checker(zip_path: str, target_file: str, use_numpy: bool) -> tuple:
+    # 암호화 방식에 맞는 검사기와 batch 크기. 암호화 헤더/salt는 여기서 한 번만 읽어둔다
+    if is_aes(zip_path, target_file):
+        return AesChecker(zip_path, target_file), AES_BATCH
+    if use_numpy: # numpy는 배치 모드에서만 필요하므로 이때만 import
+        from zipcrypto_np import NumpyZipCryptoChecker
+        return NumpyZipCryptoChecker(zip_path, target_file), NP_BATCH
+    return ZipCryptoChecker(zip_path, target_file), BATCH
+
+def unlock_zip(pid, lock, counters, cursor, finished, done_q, source, stop, found, zip_path=ZIPFILE,
+               use_numpy=False, chunk_size=CHUNK):
+    # stop/found 이벤트와 zip_path는 인자로 받는다 (spawn 방식에서는 모듈 전역이 워커마다 새로 만들어지므로)
     try:
-        if not zipfile.is_zipfile(ZIPFILE):
+        if not zipfile.is_zipfile(zip_path):
             with lock:
                 print("The file is not a zip file.")
             os._exit(1)
 
-        with zipfile.ZipFile(ZIPFILE, "r") as zf:
+        with zipfile.ZipFile(zip_path, "r") as zf:
             file_list = zf.namelist()
             if not file_list:
                 with lock:
@@ -46,112 +88,270 @@ def unlock_zip(pid, lock):
                 os._exit(1)
 
             target_file = file_list[0] ## password.txt
-            now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            checker, batch = open_checker(zip_path, target_file, use_numpy)
             start = time.time()
-            idx = int(N / PROCS * pid)
-            end = int(N /PROCS * (pid + 1))
-            for i in range(idx, end):
-                if STOP.is_set():
-                    os._exit(1)
-                cur = time.time()
-                lapsed = round((cur - start), 2)
-
-                with lock:
-                    _cnt += 1
-
-                password = gen_code(i)
-                try:
-                    ret = zf.read(target_file, pwd=password)
-                    if ret:
-                        STOP.set()
-                        zf.extract(target_file, pwd=password)
-                        end = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        msg = f"\nSuccess! The password is: {password.decode()} pid: {pid} Ended at: {end} Lapsed: {lapsed} seconds".encode('utf-8')
-                        with lock:
-                            os.write(1, msg)
-                        os._exit(0)
-
-                except (RuntimeError, zipfile.BadZipFile, zlib.error):
-                    msg = f"pid: {pid} Tried: {password} Count: {_cnt} Start: {now} Lapsed: {lapsed}\r".encode('utf-8')
+            report = make_report(counters, pid, stop)
+            # 고정 구간 대신 끝날 때마다 다음 chunk_size 구간을 가져가므로 느린 워커가 있어도 다른 워커가 나머지를 처리한다
+            while (chunk := next_chunk(cursor, finished, source.total, chunk_size)) is not None:
+                # 브루트포스(Keyspace)든 사전(Wordlist)이든 같은 checker로 구간을 검사한다
+                # ZipCrypto는 check byte, AES는 PBKDF2 verification value로 대부분 걸러내고 통과한 후보만 전체 검증
+                password = source.scan(checker, *chunk, report, batch)
+                if password is not None:
+                    found.set()
+                    stop.set()
+                    lapsed = round((time.time() - start), 2)
+                    ended = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    msg = f"\nSuccess! The password is: {password.decode()} pid: {pid} Ended at: {ended} Lapsed: {lapsed} seconds".encode('utf-8')
                     with lock:
                         os.write(1, msg)
-                    continue
-        with lock:
-            print("Password not found.")
+                    # 압축 해제가 실패해도 비밀번호는 이미 출력된 상태로 남는다
+                    try:
+                        checker.extract(password) # AES는 stdlib zipfile로 풀 수 없어서 checker가 직접 푼다
+                    except ImportError:
+                        with lock:
+                            print("\n[AES] Install 'cryptography' to extract the file.")
+                    except (RuntimeError, zipfile.BadZipFile, zlib.error, NotImplementedError, OSError) as e:
+                        with lock:
+                            print(f"\nExtraction failed: {e}")
+                    os._exit(0)
+                done_q.put(chunk) # 끝까지 검사한 구간만 checkpoint에 기록된다
 
     except (RuntimeError, KeyboardInterrupt):
         zf.close()
         os._exit(1)
 
-def unlock_zip_main():
+def report_progress(counters, total, unit, started, done, stop):
+    # 워커별 카운터를 합산해서 전체 속도와 남은 시간을 주기적으로 출력
+    while not done.wait(REPORT_INTERVAL) and not stop.is_set():
+        cnt = sum(counters)
+        lapsed = time.time() - started
+        rate = cnt / lapsed if lapsed > 0 else 0
+        eta = datetime.timedelta(seconds=int((total - cnt) / rate)) if rate else "-"
+        msg = f"Tried: {cnt}/{total} ({cnt / total:.2%}) Rate: {rate:,.0f} {unit}/s Lapsed: {lapsed:.1f}s ETA: {eta}\r"
+        os.write(1, msg.encode('utf-8'))
+
+def save_progress(done_q, finished, path, meta, done):
+    # 워커가 끝낸 구간을 모아두었다가 CHECKPOINT_INTERVAL 마다 상태 파일에 저장
+    last = time.time()
+    while not done.is_set():
+        try:
+            finished.append(done_q.get(timeout=REPORT_INTERVAL))
+        except queue.Empty:
+            pass
+        if time.time() - last >= CHECKPOINT_INTERVAL:
+            checkpoint.save(path, meta, finished)
+            last = time.time()
+
+def unlock_zip_main(source: Keyspace | Wordlist = KEYSPACE, resume: bool = False, use_numpy: bool = False,
+                    procs: int = PROCS, chunk_size: int | None = None, zip_path: str = ZIPFILE) -> bool:
+    # source: 후보 공간. 전역 인덱스 [0, total)를 chunk_size 단위로 procs개 워커에게 나눠준다. 찾으면 True
+    # chunk_size를 주지 않으면 source가 정한 크기 (사전은 바이트 단위라 따로 정한다), 없으면 CHUNK
+    if chunk_size is None:
+        chunk_size = source.chunk_size(procs) if hasattr(source, "chunk_size") else CHUNK
+    stop = mp.Event()
+    found = mp.Event()
+    total = source.total
+    meta = {"zipfile": os.path.basename(zip_path), "source": source.describe()}
+    state = checkpoint.state_path(zip_path)
+    finished = checkpoint.load(state, meta) if resume else []
+    left = checkpoint.remaining(finished, total)
+    if resume:
+        print(f"[resume] {total - left}/{total} already tried, {left} left.")
+
     lock = Lock()
+    counters = mp.Array('Q', procs, lock=False) # 워커마다 한 칸씩 쓰는 공유 메모리 카운터
+    cursor = mp.Value('Q', 0) # 다음에 나눠줄 전역 인덱스
+    done_q = mp.Queue()
+    done = threading.Event()
+    reporter = threading.Thread(target=report_progress, args=(counters, left or 1, source.unit, time.time(), done, stop), daemon=True)
+    saver = threading.Thread(target=save_progress, args=(done_q, finished, state, meta, done), daemon=True)
+    proc_list = []
     try:
-        proc_list = []    
-        for rank in range(PROCS):
-            p = Process(target=unlock_zip, args=(rank, lock))
+        for rank in range(procs):
+            p = Process(target=unlock_zip, args=(rank, lock, counters, cursor, list(finished), done_q, source, stop, found,
+                                                   zip_path, use_numpy, chunk_size))
             p.start()
             proc_list.append(p)
+        reporter.start()
+        saver.start()
         for p in proc_list:
             p.join()
 
     except KeyboardInterrupt:
         print("\r\nMain process stopped by Ctrl-C...")
-        STOP.set()
+        stop.set()
         for p in proc_list:
             p.join()
-        for p in proc_list:
-            if p.is_alive():
-                p.terminate()
     except Exception:
-        STOP.set()
+        stop.set()
         for p in proc_list:
             p.join()
+    finally:
         for p in proc_list:
             if p.is_alive():
                 p.terminate()
+        done.set()
+        if saver.is_alive():
+            saver.join()
+        while True: # 저장 스레드가 멈춘 뒤 큐에 남은 구간까지 반영
+            try:
+                finished.append(done_q.get(timeout=0.1))
+            except queue.Empty:
+                break
+
+    if found.is_set():
+        if os.path.exists(state):
+            os.remove(state)
+        return True
+    checkpoint.save(state, meta, finished)
+    if stop.is_set():
+        print(f"Progress saved to {state}. Run again with --resume to continue.")
+    else:
+        print("\nPassword not found.")
+    return False
 
 # 카이사르 암호는 영문자를 특정 숫자 만큼 모두 양의 값만큼 옮겨서(shift) 만드는 암호다.
 # 따라서 반대로 옮겨진 값만큼 이동시켜서 의미있는 문장인지 확인하면 된다.
 alphabet = string.ascii_uppercase
 
-def caesar_cipher_decode(target_text: str) -> list:
-    code_list = []
-    for shift in range(len(alphabet)):  # 0 ~ 25
-        decoded = ""
-        for char in target_text:
-            if char.isalpha():
-                is_upper = char.isupper()
-                base = ord('A') if is_upper else ord('a')
-                decoded += chr((ord(char) - base - shift) % 26 + base) # 파이썬에서는 모드연산이 음수도 가능(자동으로 양수로 바꿔줌)
-            else:
-                decoded += char
-        print(f"[Shift {shift}] {decoded}")
-        code_list.append(decoded)
-    
+def caesar_cipher_decode(target_text: str, verbose: bool = True) -> list:
+    # shift별 변환표는 classical.SHIFT_TABLES에 미리 만들어져 있어서 한 글자씩 문자열을 이어붙이지 않는다
+    code_list = [caesar_decode(target_text, shift) for shift in range(len(alphabet))]  # 0 ~ 25
+    if verbose:
+        for shift, decoded in enumerate(code_list):
+            print(f"[Shift {shift}] {decoded}")
     return code_list
 
-def caesar_cipher_main():
+def caesar_cipher_main(interactive: bool = False):
     try:
         with open("password.txt", "r", encoding="utf-8") as f:
             encrypted_text = f.read().strip()
 
         print("암호화된 문자열:", encrypted_text)
-        candidated = caesar_cipher_decode(encrypted_text)
+        # 영어 글자 빈도와 가장 비슷한(chi-squared가 가장 작은) shift를 자동으로 고른다
+        ranking = rank_shifts(encrypted_text)
+        best = ranking[0][1]
+        for score, shift in ranking[:3]:
+            print(f"  [추천] Shift {shift:2d} (chi²={score:8.2f}) {caesar_decode(encrypted_text, shift)}")
 
-        shift_num = int(input("\n정답이라고 생각되는 Shift 번호를 입력하세요: "))
-        final_result = candidated[shift_num]
+        shift_num = best
+        if interactive: # 자동 선택이 틀렸을 때 사람이 직접 고를 수 있도록
+            caesar_cipher_decode(encrypted_text)
+            ans = input(f"\n정답이라고 생각되는 Shift 번호를 입력하세요 (Enter: {best}): ").strip()
+            shift_num = int(ans) if ans else best
+        final_result = caesar_decode(encrypted_text, shift_num)
 
         with open("result.txt", "w", encoding="utf-8") as f:
             f.write(final_result)
 
-        print("\n최종 해독 결과가 result.txt에 저장되었습니다.")
+        print(f"\n[Shift {shift_num}] {final_result}")
+        print("최종 해독 결과가 result.txt에 저장되었습니다.")
 
     except Exception as e:
         print(f"[caesar] Error: {e}")
 
+def vigenere_main(path: str = "password.txt", max_len: int = 20, top: int = 5):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            encrypted_text = f.read().strip()
+
+        print("암호화된 문자열:", encrypted_text[:200])
+        # 일치 지수로 키 길이 후보를 찾고, 열마다 카이사르처럼 chi-squared로 키 글자를 고른다
+        ranked = vigenere_solve(encrypted_text, max_len, top)
+        for rank, (ioc, key, plain) in enumerate(ranked, 1):
+            print(f"  [{rank}] key={key!r} (len {len(key)}, IoC={ioc:.4f}) {plain[:80]}")
+
+        _, key, final_result = ranked[0]
+        with open("result.txt", "w", encoding="utf-8") as f:
+            f.write(final_result)
+
+        print(f"\n[Key {key}] {final_result[:200]}")
+        print("최종 해독 결과가 result.txt에 저장되었습니다.")
+
+    except Exception as e:
+        print(f"[vigenere] Error: {e}")
+
+def collect_files(paths: list, pattern: str) -> list:
+    # 파일은 그대로, 디렉토리는 pattern에 맞는 파일을 재귀적으로 모은다 (이미 만든 결과 파일은 제외)
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = sorted(glob.glob(os.path.join(path, "**", pattern), recursive=True))
+            files.extend(f for f in found if os.path.isfile(f))
+        else:
+            files.append(path)
+    return [f for f in files if not os.path.splitext(f)[0].endswith(RESULT_SUFFIX)]
+
+def caesar_batch_main(paths: list, shift: int | None = None, procs: int = PROCS,
+                      chunk_size: int = DECODE_CHUNK, pattern: str = "*.txt"):
+    # 여러 파일을 청크 단위로 나눠 프로세스 풀에서 해독. 워커 하나가 들고 있는 데이터는 chunk_size 뿐이다
+    tasks = []
+    for src in collect_files(paths, pattern):
+        root, ext = os.path.splitext(src)
+        dst = root + RESULT_SUFFIX + ext
+        file_shift = shift if shift is not None else detect_shift(src, DECODE_SAMPLE)
+        size = os.path.getsize(src)
+        with open(dst, "wb") as f: # 워커들이 각자 위치에 쓸 수 있도록 결과 파일 크기를 미리 잡아둔다
+            f.truncate(size)
+        print(f"[caesar] {src} -> {dst} (Shift {file_shift}, {size} bytes)")
+        tasks.extend((src, dst, off, min(chunk_size, size - off), file_shift) for off in range(0, size, chunk_size))
+
+    if not tasks:
+        print("[caesar] 해독할 파일이 없습니다.")
+        return
+    total = sum(task[3] for task in tasks)
+    started = time.time()
+    done = 0
+    with mp.Pool(procs) as pool:
+        for size in pool.imap_unordered(decode_chunk, tasks):
+            done += size
+            lapsed = time.time() - started
+            os.write(1, f"[caesar] {done}/{total} bytes ({done / total:.1%}) {done / 1e6 / max(lapsed, 1e-9):.1f} MB/s\r".encode('utf-8'))
+    print("\n[caesar] 완료")
+
 def main():
-    #unlock_zip_main()
-    caesar_cipher_main()
+    parser = argparse.ArgumentParser(description="door hacking tools")
+    sub = parser.add_subparsers(dest="mode")
+    zip_parser = sub.add_parser("zip", help="brute-force the ZIPFILE password")
+    zip_parser.add_argument("--resume", action="store_true", help="skip ranges saved in the state file")
+    zip_parser.add_argument("--charset", default="?l?d", help="characters or classes ?l ?u ?d ?s ?a (default: ?l?d)")
+    zip_parser.add_argument("--min-len", type=int, default=LENGTH, help=f"shortest password length (default: {LENGTH})")
+    zip_parser.add_argument("--max-len", type=int, default=LENGTH, help=f"longest password length (default: {LENGTH})")
+    zip_parser.add_argument("--mask", action="append", help="per-position mask like ?l?l?d?d?d?d (repeatable, overrides charset/length)")
+    zip_parser.add_argument("--wordlist", help="try words from this file instead of brute force")
+    zip_parser.add_argument("--rules", default="", help=f"comma separated mangling rules for --wordlist: {','.join(RULES)}")
+    zip_parser.add_argument("--procs", type=int, default=PROCS, help=f"number of worker processes (default: {PROCS})")
+    zip_parser.add_argument("--numpy", action="store_true", help="check brute-force candidates in NumPy batches")
+    caesar_parser = sub.add_parser("caesar", help="decode password.txt (default)")
+    caesar_parser.add_argument("--interactive", action="store_true", help="show all shifts and choose one by hand")
+    caesar_parser.add_argument("paths", nargs="*", help="files or directories to decode in batch (default: password.txt)")
+    caesar_parser.add_argument("--shift", type=int, help="use this shift instead of detecting it per file")
+    caesar_parser.add_argument("--pattern", default="*.txt", help="file pattern used inside directories (default: *.txt)")
+    caesar_parser.add_argument("--procs", type=int, default=PROCS, help=f"number of worker processes (default: {PROCS})")
+    caesar_parser.add_argument("--chunk-size", type=int, default=DECODE_CHUNK, help=f"bytes per task (default: {DECODE_CHUNK})")
+    vigenere_parser = sub.add_parser("vigenere", help="recover the Vigenère key of a file and decode it")
+    vigenere_parser.add_argument("path", nargs="?", default="password.txt", help="ciphertext file (default: password.txt)")
+    vigenere_parser.add_argument("--max-len", type=int, default=20, help="longest key length to consider (default: 20)")
+    vigenere_parser.add_argument("--top", type=int, default=5, help="number of key lengths to try (default: 5)")
+    args = parser.parse_args()
+
+    if args.mode == "zip":
+        try:
+            if args.wordlist:
+                source = Wordlist(args.wordlist, [r for r in args.rules.split(",") if r])
+            elif args.mask:
+                source = Keyspace.from_masks(args.mask)
+            else:
+                source = Keyspace.from_charset(parse_charset(args.charset), args.min_len, args.max_len)
+        except (ValueError, OSError) as e:
+            parser.error(str(e))
+        unlock_zip_main(source, resume=args.resume, use_numpy=args.numpy, procs=args.procs)
+    elif args.mode == "vigenere":
+        vigenere_main(args.path, args.max_len, args.top)
+    elif getattr(args, "paths", None):
+        caesar_batch_main(args.paths, args.shift, args.procs, args.chunk_size, args.pattern)
+    else:
+        caesar_cipher_main(interactive=getattr(args, "interactive", False))
 
 if __name__ == "__main__":
     main()
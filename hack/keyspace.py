@@ -0,0 +1,149 @@
+## codyssey part5 - 1 [keyspace] ##
+## Mariner_정찬수 ##
+
+# 자동차 주행거리계(odometer)처럼 마지막 자리만 1씩 올리고, 넘치면 앞자리로 자리올림한다.
+# gen_code(i)처럼 매번 divmod로 전체 자리를 다시 만들 필요가 없다.
+
+import bisect
+import math
+import string
+
+
+class Odometer:
+    def __init__(self, alphabets, start: int = 0):
+        self.alphabets = [bytes(a) for a in alphabets] # 자리별 사용 문자 (앞자리부터)
+        self.length = len(self.alphabets)
+        self.digits = [0] * self.length
+        self.code = bytearray(self.length)
+        self.seek(start)
+
+    def seek(self, index: int):
+        # 임의 위치로 이동할 때만 divmod로 자리를 풀어둔다
+        for pos in range(self.length - 1, -1, -1):
+            index, r = divmod(index, len(self.alphabets[pos]))
+            self.digits[pos] = r
+            self.code[pos] = self.alphabets[pos][r]
+
+    def index(self) -> int:
+        # 현재 후보의 (segment 내) 인덱스
+        index = 0
+        for a, d in zip(self.alphabets, self.digits):
+            index = index * len(a) + d
+        return index
+
+    def step(self) -> int:
+        # 다음 후보로 이동. 바뀐 자리 중 가장 앞 자리 번호를 반환, 한 바퀴 돌면 -1
+        digits, code, alphabets = self.digits, self.code, self.alphabets
+        pos = self.length - 1
+        while pos >= 0:
+            d = digits[pos] + 1
+            if d < len(alphabets[pos]):
+                digits[pos] = d
+                code[pos] = alphabets[pos][d]
+                return pos
+            digits[pos] = 0
+            code[pos] = alphabets[pos][0]
+            pos -= 1
+        return -1
+
+
+# 마스크/문자셋에서 쓰는 문자 클래스 (hashcat 표기와 같음)
+CHARSETS = {
+    "l": string.ascii_lowercase,
+    "u": string.ascii_uppercase,
+    "d": string.digits,
+    "s": " " + string.punctuation,
+}
+CHARSETS["a"] = CHARSETS["l"] + CHARSETS["u"] + CHARSETS["d"] + CHARSETS["s"]
+
+
+def _tokens(spec: str):
+    # "?l?dxyz" -> ["?l", "?d", "x", "y", "z"]
+    i = 0
+    while i < len(spec):
+        if spec[i] == "?" and i + 1 < len(spec):
+            yield spec[i:i + 2]
+            i += 2
+        else:
+            yield spec[i]
+            i += 1
+
+
+def _expand(token: str) -> str:
+    if len(token) == 2:
+        if token == "??":
+            return "?"
+        if token[1] not in CHARSETS:
+            raise ValueError(f"Unknown charset class: {token}")
+        return CHARSETS[token[1]]
+    return token
+
+
+def _encode(chars: str) -> bytes:
+    # Odometer는 한 자리를 1바이트로 다루므로 UTF-8 여러 바이트 문자(예: "가")는 받지 않는다
+    if not chars.isascii():
+        raise ValueError(f"Only ASCII characters are supported: {chars!r}")
+    return chars.encode("ascii")
+
+
+def parse_charset(spec: str) -> bytes:
+    # "?l?d" 처럼 클래스를 쓰거나 "abc123" 처럼 문자를 직접 나열. 중복은 처음 나온 순서대로 제거
+    chars = "".join(_expand(t) for t in _tokens(spec))
+    return _encode("".join(dict.fromkeys(chars)))
+
+
+def parse_mask(mask: str) -> list:
+    # "?l?l?d?d?d?d" -> 자리별 문자셋 목록. 클래스가 아닌 문자는 그 자리에 고정
+    return [_encode(_expand(t)) for t in _tokens(mask)]
+
+
+class Keyspace:
+    # 여러 구간(segment, 자리별 문자셋 목록)을 짧은 길이부터 이어붙인 하나의 인덱스 공간.
+    # 스케줄러와 checkpoint는 전역 인덱스 [0, total)만 다루고, 워커가 split()으로 구간별로 나눠 탐색한다.
+    unit = "candidates"
+
+    def __init__(self, segments: list):
+        self.segments = sorted(([bytes(a) for a in seg] for seg in segments), key=len) # stable: 같은 길이는 입력 순서 유지
+        self.sizes = [math.prod(len(a) for a in seg) for seg in self.segments]
+        self.offsets = [0]
+        for size in self.sizes:
+            self.offsets.append(self.offsets[-1] + size)
+        self.total = self.offsets[-1]
+
+    @classmethod
+    def from_charset(cls, charset: bytes, min_len: int, max_len: int):
+        return cls([[charset] * n for n in range(min_len, max_len + 1)])
+
+    @classmethod
+    def from_masks(cls, masks: list):
+        return cls([parse_mask(m) for m in masks])
+
+    def split(self, lo: int, hi: int):
+        # 전역 구간 [lo, hi)를 segment 경계에서 잘라 (자리별 문자셋, segment 내 시작 인덱스, 개수)로 반환
+        k = bisect.bisect_right(self.offsets, lo) - 1
+        while lo < hi and k < len(self.segments):
+            end = min(hi, self.offsets[k + 1])
+            yield self.segments[k], lo - self.offsets[k], end - lo
+            lo = end
+            k += 1
+
+    def scan(self, checker, lo: int, hi: int, report, batch: int = 4096) -> bytes | None:
+        # 전역 구간 [lo, hi)를 batch 단위로 검사하고, 끝낸 개수를 report에 넘긴다
+        for alphabets, i, count in self.split(lo, hi):
+            odo = Odometer(alphabets, i)
+            while count > 0:
+                n = min(batch, count)
+                password = checker.scan(odo, n)
+                if password is not None:
+                    return password
+                count -= n
+                report(n)
+        return None
+
+    def candidate(self, index: int) -> bytes:
+        alphabets, start, _ = next(self.split(index, index + 1))
+        return bytes(Odometer(alphabets, start).code)
+
+    def describe(self) -> list:
+        # checkpoint에서 같은 키스페이스인지 비교하는 용도
+        return [[a.decode("utf-8") for a in seg] for seg in self.segments]
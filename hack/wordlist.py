@@ -0,0 +1,108 @@
+## codyssey part5 - 1 [wordlist] ##
+## Mariner_정찬수 ##
+
+# 사전(wordlist) 기반 후보 생성기.
+# 파일 전체를 읽지 않고 mmap으로 필요한 구간만 훑기 때문에 수 GB 사전도 메모리가 일정하다.
+# 스케줄러에는 바이트 오프셋 [0, 파일 크기)를 인덱스 공간으로 넘겨주고,
+# 각 줄은 그 줄의 첫 바이트가 속한 구간에서만 처리한다.
+
+import mmap
+import os
+
+CHUNK = 64 * 1024 # 워커가 한 번에 가져가는 바이트 구간 최대 크기
+CHUNKS_PER_PROC = 8 # 작은 사전도 워커마다 이 정도 구간이 돌아가도록 나눈다
+LEET = bytes.maketrans(b"aeiostAEIOST", b"431057431057")
+
+
+def rule_case(word: bytes):
+    return word, word.lower(), word.upper(), word.capitalize(), word.swapcase()
+
+
+def rule_digits(word: bytes):
+    yield word
+    for i in range(10):
+        yield word + b"%d" % i
+    for i in range(100):
+        yield word + b"%02d" % i
+    yield word + b"123"
+    yield word + b"1234"
+
+
+def rule_leet(word: bytes):
+    return word, word.translate(LEET)
+
+
+def rule_symbol(word: bytes):
+    yield word
+    for ch in "!@#$":
+        yield word + ch.encode()
+
+
+RULES = {
+    "case": rule_case,
+    "digits": rule_digits,
+    "leet": rule_leet,
+    "symbol": rule_symbol,
+}
+
+
+def mangle(word: bytes, rules) -> list:
+    # 규칙을 순서대로 겹쳐 적용 (각 규칙은 원래 단어도 포함). 중복은 처음 순서대로 제거
+    words = [word]
+    for rule in rules:
+        words = list(dict.fromkeys(w for x in words for w in rule(x)))
+    return words
+
+
+class Wordlist:
+    unit = "bytes"
+
+    def __init__(self, path: str, rules: list | None = None):
+        self.path = os.path.abspath(path)
+        self.rule_names = list(rules or [])
+        for name in self.rule_names:
+            if name not in RULES:
+                raise ValueError(f"Unknown rule: {name} (choose from {', '.join(RULES)})")
+        self.total = os.path.getsize(self.path)
+
+    def lines(self, lo: int, hi: int):
+        # 첫 바이트가 [lo, hi)에 있는 줄만 내보낸다. 앞 구간에서 이어지는 줄은 건너뜀
+        if self.total == 0:
+            return
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0 if lo == 0 else mm.find(b"\n", lo - 1) + 1
+            if pos == 0 and lo > 0:
+                return
+            while pos < min(hi, self.total):
+                nl = mm.find(b"\n", pos)
+                if nl < 0:
+                    nl = self.total
+                end = min(nl + 1, self.total)
+                yield mm[pos:nl].rstrip(b"\r"), end - pos
+                pos = end
+
+    def chunk_size(self, procs: int) -> int:
+        # 인덱스가 바이트라서 후보 수 기준인 door_hacking.CHUNK를 쓰면 1MB 미만 사전은 한 구간이 된다
+        return max(1, min(CHUNK, self.total // (procs * CHUNKS_PER_PROC)))
+
+    def scan(self, checker, lo: int, hi: int, report, batch: int = 4096) -> bytes | None:
+        # 사전 구간을 읽으며 규칙을 적용한 후보를 검사. 진행량은 처리한 바이트 수로 report에 넘긴다
+        rules = [RULES[name] for name in self.rule_names]
+        done = 0
+        tried = 0
+        for word, size in self.lines(lo, hi):
+            if word: # 빈 줄은 건너뜀
+                for password in mangle(word, rules):
+                    if checker.try_password(password):
+                        return password
+                    tried += 1
+            done += size
+            if tried >= batch:
+                report(done)
+                done = tried = 0
+        report(done)
+        return None
+
+    def describe(self) -> dict:
+        # checkpoint에서 같은 사전/규칙인지 비교하는 용도
+        return {"wordlist": self.path, "size": self.total, "rules": self.rule_names}
@@ -0,0 +1,130 @@
+## codyssey part5 - 1 [zipaes] ##
+## Mariner_정찬수 ##
+
+# WinZip AES(AE-1/AE-2) 암호화 zip 전용 비밀번호 검사기.
+# 표준 zipfile은 compress_type 99(AES)를 읽지 못하므로 extra field(0x9901)와 salt를 직접 파싱한다.
+# PBKDF2-HMAC-SHA1(1000회)로 만든 키의 마지막 2바이트(password verification value)로
+# 복호화 없이 후보를 거르고, 통과한 후보만 HMAC-SHA1 인증 코드로 최종 확인한다.
+# 실제 파일 복호화(extract)에만 AES가 필요하므로 그때만 cryptography 패키지를 import 한다.
+
+import hashlib
+import hmac
+import os
+import struct
+import zipfile
+import zlib
+
+AES_METHOD = 99
+AES_EXTRA_ID = 0x9901
+SALT_SIZE = {1: 8, 2: 12, 3: 16} # strength -> salt 길이
+KEY_SIZE = {1: 16, 2: 24, 3: 32} # strength -> AES 키 길이
+PBKDF2_ITERATIONS = 1000
+VERIFIER_SIZE = 2
+AUTH_SIZE = 10
+
+
+def is_aes(zip_path: str, member: str | None = None) -> bool:
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        info = zf.getinfo(member) if member else zf.infolist()[0]
+    return info.compress_type == AES_METHOD
+
+
+def _parse_extra(extra: bytes) -> tuple:
+    # extra field에서 AES 정보(버전, 강도, 실제 압축 방식)를 찾는다
+    pos = 0
+    while pos + 4 <= len(extra):
+        header_id, size = struct.unpack("<HH", extra[pos:pos + 4])
+        if header_id == AES_EXTRA_ID:
+            version, vendor, strength, method = struct.unpack("<H2sBH", extra[pos + 4:pos + 4 + 7])
+            if vendor != b"AE":
+                break
+            return version, strength, method
+        pos += 4 + size
+    raise zipfile.BadZipFile("AES extra field (0x9901) not found.")
+
+
+class AesChecker:
+    def __init__(self, zip_path: str, member: str | None = None):
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            infos = [i for i in zf.infolist() if not i.is_dir()]
+            if not infos:
+                raise zipfile.BadZipFile("No files found in the zip.")
+            info = zf.getinfo(member) if member else infos[0]
+
+        if info.compress_type != AES_METHOD:
+            raise zipfile.BadZipFile(f"{info.filename} is not AES encrypted.")
+        self.version, self.strength, self.method = _parse_extra(info.extra)
+        if self.strength not in SALT_SIZE:
+            raise zipfile.BadZipFile(f"Unknown AES strength: {self.strength}")
+        if self.method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise NotImplementedError(f"compress_type {self.method} is not supported.")
+
+        with open(zip_path, "rb") as f:
+            f.seek(info.header_offset)
+            sig, *_, fnlen, extlen = struct.unpack("<IHHHHHIIIHH", f.read(30))
+            if sig != 0x04034B50:
+                raise zipfile.BadZipFile("Bad local file header.")
+            f.seek(fnlen + extlen, 1)
+            payload = f.read(info.compress_size)
+
+        salt_size = SALT_SIZE[self.strength]
+        self.key_size = KEY_SIZE[self.strength]
+        self.member = info.filename
+        self.crc = info.CRC # AE-2는 0으로 저장됨
+        self.file_size = info.file_size
+        self.salt = payload[:salt_size]
+        self.verifier = payload[salt_size:salt_size + VERIFIER_SIZE]
+        self.body = payload[salt_size + VERIFIER_SIZE:-AUTH_SIZE]
+        self.auth = payload[-AUTH_SIZE:]
+
+    def derive(self, password: bytes) -> bytes:
+        # AES 키 + HMAC 키 + verification value(2바이트)
+        return hashlib.pbkdf2_hmac("sha1", password, self.salt, PBKDF2_ITERATIONS, 2 * self.key_size + VERIFIER_SIZE)
+
+    def check(self, password: bytes) -> bool:
+        return self.derive(password)[-VERIFIER_SIZE:] == self.verifier
+
+    def verify(self, password: bytes) -> bool:
+        # verification value는 1/65536 확률로 우연히 맞으므로 암호문 전체의 HMAC으로 최종 확인
+        keys = self.derive(password)
+        mac_key = keys[self.key_size:2 * self.key_size]
+        mac = hmac.new(mac_key, self.body, hashlib.sha1).digest()[:AUTH_SIZE]
+        return keys[-VERIFIER_SIZE:] == self.verifier and hmac.compare_digest(mac, self.auth)
+
+    def try_password(self, password: bytes) -> bool:
+        return self.check(password) and self.verify(password)
+
+    def scan(self, odometer, count: int) -> bytes | None:
+        # PBKDF2 비용이 후보 생성보다 훨씬 크므로 prefix 캐시 없이 하나씩 검사
+        for _ in range(count):
+            if self.check(odometer.code):
+                password = bytes(odometer.code)
+                if self.verify(password):
+                    return password
+            if odometer.step() < 0:
+                break
+        return None
+
+    def decrypt(self, password: bytes) -> bytes:
+        # WinZip AES는 little-endian 카운터(1부터 시작)를 쓰는 CTR 모드
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+        key = self.derive(password)[:self.key_size]
+        encryptor = Cipher(algorithms.AES(key), modes.ECB()).encryptor()
+        blocks = (len(self.body) + 15) // 16
+        counters = b"".join((i + 1).to_bytes(16, "little") for i in range(blocks))
+        stream = encryptor.update(counters) + encryptor.finalize()
+        plain = bytes(c ^ s for c, s in zip(self.body, stream))
+        if self.method == zipfile.ZIP_DEFLATED:
+            plain = zlib.decompress(plain, -15)
+        if self.version == 1 and zlib.crc32(plain) != self.crc:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file {self.member}")
+        return plain
+
+    def extract(self, password: bytes, path: str = ".") -> str:
+        target = os.path.join(path, self.member)
+        plain = self.decrypt(password) # 복호화/압축 해제가 실패하면 빈 파일을 남기지 않도록 먼저 푼다
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(plain)
+        return target
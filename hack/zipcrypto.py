@@ -0,0 +1,186 @@
+## codyssey part5 - 1 [zipcrypto] ##
+## Mariner_정찬수 ##
+
+# 전통 ZIP 암호(ZipCrypto) 전용 비밀번호 검사기.
+# zf.read()는 후보마다 central directory 파싱, 복호화 준비, zlib, CRC 까지 모두 수행한다.
+# 여기서는 12바이트 암호화 헤더를 한 번만 읽어두고, 마지막 바이트(check byte)만 비교해서
+# 대부분의 후보를 걸러낸 뒤 살아남은 극소수만 전체 복호화 + CRC 검증을 한다.
+
+import lzma
+import os
+import struct
+import time
+import zipfile
+import zlib
+
+KEY0, KEY1, KEY2 = 0x12345678, 0x23456789, 0x34567890
+HEADER_SIZE = 12
+
+
+def _make_crc_table() -> list:
+    table = []
+    for i in range(256):
+        c = i
+        for _ in range(8):
+            c = (c >> 1) ^ 0xEDB88320 if c & 1 else c >> 1
+        table.append(c)
+    return table
+
+
+CRC_TABLE = _make_crc_table()
+
+
+def update_keys(k0: int, k1: int, k2: int, byte: int) -> tuple:
+    k0 = (k0 >> 8) ^ CRC_TABLE[(k0 ^ byte) & 0xFF]
+    k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+    k2 = (k2 >> 8) ^ CRC_TABLE[(k2 ^ (k1 >> 24)) & 0xFF]
+    return k0, k1, k2
+
+
+def init_keys(password: bytes, keys: tuple = (KEY0, KEY1, KEY2)) -> tuple:
+    k0, k1, k2 = keys
+    for b in password:
+        k0, k1, k2 = update_keys(k0, k1, k2, b)
+    return k0, k1, k2
+
+
+def decrypt(keys: tuple, data: bytes) -> bytes:
+    k0, k1, k2 = keys
+    out = bytearray(len(data))
+    for i, c in enumerate(data):
+        t = (k2 | 2) & 0xFFFF
+        p = c ^ (((t * (t ^ 1)) >> 8) & 0xFF)
+        out[i] = p
+        k0, k1, k2 = update_keys(k0, k1, k2, p)
+    return bytes(out)
+
+
+def encrypt(keys: tuple, data: bytes) -> bytes:
+    k0, k1, k2 = keys
+    out = bytearray(len(data))
+    for i, p in enumerate(data):
+        t = (k2 | 2) & 0xFFFF
+        out[i] = p ^ (((t * (t ^ 1)) >> 8) & 0xFF)
+        k0, k1, k2 = update_keys(k0, k1, k2, p)
+    return bytes(out)
+
+
+def write_encrypted_zip(path: str, name: str, data: bytes, password: bytes, data_descriptor: bool = False) -> None:
+    # 파일 하나를 deflate + ZipCrypto로 암호화한 zip 생성 (zipfile 모듈은 암호화 쓰기를 지원하지 않음)
+    # 벤치마크에서 비밀번호를 알고 있는 테스트용 아카이브를 만들 때 사용
+    comp = zlib.compressobj(9, zlib.DEFLATED, -15)
+    body = comp.compress(data) + comp.flush()
+    crc = zlib.crc32(data)
+    t = time.localtime()
+    mtime = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    mdate = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    flag = 0x1 | (0x8 if data_descriptor else 0)
+    check = (mtime >> 8) & 0xFF if data_descriptor else (crc >> 24) & 0xFF
+    payload = encrypt(init_keys(password), os.urandom(HEADER_SIZE - 1) + bytes([check]) + body)
+
+    fname = name.encode("utf-8")
+    local_crc, local_csize, local_usize = (0, 0, 0) if data_descriptor else (crc, len(payload), len(data))
+    local = struct.pack("<IHHHHHIIIHH", 0x04034B50, 20, flag, zipfile.ZIP_DEFLATED, mtime, mdate,
+                        local_crc, local_csize, local_usize, len(fname), 0) + fname + payload
+    if data_descriptor:
+        local += struct.pack("<IIII", 0x08074B50, crc, len(payload), len(data))
+    central = struct.pack("<IHHHHHHIIIHHHHHII", 0x02014B50, 20, 20, flag, zipfile.ZIP_DEFLATED, mtime, mdate,
+                          crc, len(payload), len(data), len(fname), 0, 0, 0, 0, 0, 0) + fname
+    end = struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, 1, 1, len(central), len(local), 0)
+    with open(path, "wb") as f:
+        f.write(local + central + end)
+
+
+class ZipCryptoChecker:
+    def __init__(self, zip_path: str, member: str | None = None):
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            infos = [i for i in zf.infolist() if not i.is_dir()]
+            if not infos:
+                raise zipfile.BadZipFile("No files found in the zip.")
+            info = zf.getinfo(member) if member else infos[0]
+
+        if not info.flag_bits & 0x1:
+            raise zipfile.BadZipFile(f"{info.filename} is not encrypted.")
+        if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA):
+            raise NotImplementedError(f"compress_type {info.compress_type} is not supported.")
+
+        # local file header를 직접 읽어서 암호화된 데이터 위치를 찾는다.
+        with open(zip_path, "rb") as f:
+            f.seek(info.header_offset)
+            local = f.read(30)
+            sig, _, flag, _, mtime, _, _, _, _, fnlen, extlen = struct.unpack("<IHHHHHIIIHH", local)
+            if sig != 0x04034B50:
+                raise zipfile.BadZipFile("Bad local file header.")
+            f.seek(fnlen + extlen, 1)
+            payload = f.read(info.compress_size)
+
+        self.zip_path = zip_path
+        self.member = info.filename
+        self.compress_type = info.compress_type
+        self.crc = info.CRC
+        self.file_size = info.file_size
+        self.header = payload[:HEADER_SIZE]
+        self.body = payload[HEADER_SIZE:]
+        # data descriptor(bit 3)를 쓰는 경우 CRC 대신 수정시각 상위 바이트가 check byte
+        if flag & 0x8:
+            self.check_byte = (mtime >> 8) & 0xFF
+        else:
+            self.check_byte = (self.crc >> 24) & 0xFF
+
+    def check_keys(self, k0: int, k1: int, k2: int) -> bool:
+        # 비밀번호로 초기화된 키 상태에서 헤더 12바이트를 복호화하고 마지막 바이트만 비교
+        table = CRC_TABLE
+        header = self.header
+        for i in range(HEADER_SIZE - 1):
+            t = (k2 | 2) & 0xFFFF
+            p = header[i] ^ (((t * (t ^ 1)) >> 8) & 0xFF)
+            k0 = (k0 >> 8) ^ table[(k0 ^ p) & 0xFF]
+            k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+            k2 = (k2 >> 8) ^ table[(k2 ^ (k1 >> 24)) & 0xFF]
+        t = (k2 | 2) & 0xFFFF
+        return header[HEADER_SIZE - 1] ^ (((t * (t ^ 1)) >> 8) & 0xFF) == self.check_byte
+
+    def check(self, password: bytes) -> bool:
+        return self.check_keys(*init_keys(password))
+
+    def verify(self, password: bytes) -> bool:
+        # check byte는 1/256 확률로 우연히 통과하므로 전체 복호화 + CRC로 최종 확인
+        if self.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            # bzip2/LZMA는 헤더 검사만 직접 하고, 살아남은 후보는 zipfile로 풀어서 확인한다
+            try:
+                with zipfile.ZipFile(self.zip_path, "r") as zf:
+                    zf.read(self.member, pwd=password)
+            except (RuntimeError, zipfile.BadZipFile, OSError, EOFError, lzma.LZMAError):
+                return False
+            return True
+        plain = decrypt(init_keys(password), self.header + self.body)[HEADER_SIZE:]
+        try:
+            if self.compress_type == zipfile.ZIP_DEFLATED:
+                plain = zlib.decompress(plain, -15)
+        except zlib.error:
+            return False
+        return len(plain) == self.file_size and zlib.crc32(plain) == self.crc
+
+    def try_password(self, password: bytes) -> bool:
+        return self.check(password) and self.verify(password)
+
+    def extract(self, password: bytes, path: str = ".") -> str:
+        with zipfile.ZipFile(self.zip_path, "r") as zf:
+            return zf.extract(self.member, path, pwd=password)
+
+    def scan(self, odometer, count: int) -> bytes | None:
+        # odometer가 가리키는 후보부터 count개 검사. 공통 prefix의 키 상태는 캐시해두고
+        # 바뀐 자리부터만 다시 키를 갱신한다 (보통 마지막 한 글자)
+        code = odometer.code
+        L = odometer.length
+        states = [(KEY0, KEY1, KEY2)] + [None] * L
+        pos = 0
+        for _ in range(count):
+            for p in range(pos, L):
+                states[p + 1] = update_keys(*states[p], code[p])
+            if self.check_keys(*states[L]) and self.verify(bytes(code)):
+                return bytes(code)
+            pos = odometer.step()
+            if pos < 0:
+                break
+        return None
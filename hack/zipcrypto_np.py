@@ -0,0 +1,65 @@
+## codyssey part5 - 1 [zipcrypto_np] ##
+## Mariner_정찬수 ##
+
+# ZipCrypto check byte 검사를 NumPy로 한 번에 수천 개씩 처리하는 배치 버전.
+# 후보를 (개수, 길이) uint8 배열로 만들고, 키 갱신(CRC32 테이블 조회)을 행 전체에 동시에 적용한다.
+# 후보당 파이썬 인터프리터 비용이 배치 전체로 분산된다.
+
+import numpy as np
+
+from zipcrypto import CRC_TABLE, HEADER_SIZE, KEY0, KEY1, KEY2, ZipCryptoChecker
+
+CRC_TABLE_NP = np.array(CRC_TABLE, dtype=np.uint32)
+MULT = np.uint32(134775813)
+
+
+def candidates(alphabets, start: int, count: int) -> np.ndarray:
+    # segment 내 인덱스 [start, start + count)의 후보를 (count, 길이) uint8 배열로 생성
+    idx = np.arange(start, start + count, dtype=np.uint64)
+    out = np.empty((count, len(alphabets)), dtype=np.uint8)
+    for pos in range(len(alphabets) - 1, -1, -1):
+        table = np.frombuffer(bytes(alphabets[pos]), dtype=np.uint8)
+        idx, r = np.divmod(idx, np.uint64(len(table)))
+        out[:, pos] = table[r]
+    return out
+
+
+def _update(k0, k1, k2, b):
+    # zipcrypto.update_keys와 같은 연산을 배열 단위로. uint32 곱셈은 자동으로 2^32에서 wrap 된다
+    k0 = (k0 >> 8) ^ CRC_TABLE_NP[(k0 ^ b) & 0xFF]
+    k1 = (k1 + (k0 & 0xFF)) * MULT + np.uint32(1)
+    k2 = (k2 >> 8) ^ CRC_TABLE_NP[(k2 ^ (k1 >> 24)) & 0xFF]
+    return k0, k1, k2
+
+
+def _stream_byte(k2):
+    t = (k2 | 2) & 0xFFFF
+    return ((t * (t ^ 1)) >> 8) & 0xFF
+
+
+def header_check(checker: ZipCryptoChecker, cands: np.ndarray) -> np.ndarray:
+    # 각 행을 비밀번호로 키를 만들고 암호화 헤더를 복호화해서 check byte가 맞는 행 번호만 반환
+    rows = cands.shape[0]
+    k0 = np.full(rows, KEY0, dtype=np.uint32)
+    k1 = np.full(rows, KEY1, dtype=np.uint32)
+    k2 = np.full(rows, KEY2, dtype=np.uint32)
+    for col in range(cands.shape[1]):
+        k0, k1, k2 = _update(k0, k1, k2, cands[:, col].astype(np.uint32))
+    for i in range(HEADER_SIZE - 1):
+        p = np.uint32(checker.header[i]) ^ _stream_byte(k2)
+        k0, k1, k2 = _update(k0, k1, k2, p)
+    last = np.uint32(checker.header[HEADER_SIZE - 1]) ^ _stream_byte(k2)
+    return np.flatnonzero(last == checker.check_byte)
+
+
+class NumpyZipCryptoChecker(ZipCryptoChecker):
+    # scan()만 배치 버전으로 바꾼 검사기. 사전 모드처럼 후보를 하나씩 주는 경우는 부모의 try_password 사용
+
+    def scan(self, odometer, count: int) -> bytes | None:
+        cands = candidates(odometer.alphabets, odometer.index(), count)
+        for row in header_check(self, cands):
+            password = cands[row].tobytes()
+            if self.verify(password):
+                return password
+        odometer.seek(odometer.index() + count)
+        return None
@@ -7,15 +7,32 @@ import csv
 import json
 import sys
 import queue
+import threading
+import argparse
+import hashlib
+import bisect
+import multiprocessing as mp
 from datetime import datetime
 import sounddevice as sd
 import soundfile as sf
 from typing import Any
+import numpy as np
 from numpy import ndarray
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 RECORDS_DIR = os.path.join(BASE_DIR, "records")
 os.makedirs(RECORDS_DIR, exist_ok=True)
+MODEL_PATH = './vosk/vosk-model-small-en-us-0.15'
+WORKERS = 1 # 0이면 CPU 수 (메모리 예산이 있으면 그 안에서)
+MANIFEST_PATH = os.path.join(RECORDS_DIR, "stt_manifest.json")
+HASH_BLOCK = 1024 * 1024
+# 무음 구간 건너뛰기(VAD). 0.1초 블록마다 RMS(int16 기준)와 영교차율로 음성 여부를 판단
+VAD = True
+VAD_ENERGY = 300 # 이 RMS 이상이면 음성 (약 -40 dBFS)
+VAD_WEAK_RATIO = 0.3 # 에너지가 이 비율 이상이면서 영교차율이 높으면(s, f 같은 무성음) 음성
+VAD_ZCR = 0.3
+VAD_PAD = 3 # 음성 앞뒤로 남겨두는 블록 수 (문장 끝 판단과 첫/끝 음절 보존용)
+VAD_CHUNK_BLOCKS = 100 # 판단할 때 한 번에 읽는 블록 수 (10초)
 
 
 def default_samplerate(device: int | None) -> int:
@@ -26,7 +43,61 @@ def default_samplerate(device: int | None) -> int:
     except Exception:
         return 44100
 
-def record_once():
+## <---------- 녹음하면서 바로 변환(스트리밍) ----------> ##
+# 녹음 큐에서 꺼낸 블록을 파일에 쓰는 것과 동시에 별도 큐로 넘기고, 소비 스레드가 recognizer에 공급한다.
+# 부분 결과는 콘솔 한 줄에 덮어쓰고, 문장이 끝나면(최종 결과) 바로 CSV에 한 줄씩 써서 녹음 중에도 확인할 수 있다.
+
+def to_pcm16(data: ndarray) -> bytes:
+    # InputStream 기본 dtype(float32, -1~1)을 Vosk가 받는 16bit PCM으로 변환
+    if data.dtype == np.int16:
+        return data.tobytes()
+    return (np.clip(data, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+
+def result_row(j: dict, segments: list[tuple[float, float]] | None = None) -> tuple[str, str] | None:
+    # Vosk 결과 JSON -> ("시작-끝", 텍스트). 단어가 없으면 None
+    # segments가 있으면 무음을 건너뛰고 공급한 시간을 원래 파일의 시간으로 되돌린다
+    words = j.get("result")
+    text = j.get("text", "").strip()
+    if not words or not text:
+        return None
+    start, end = words[0]["start"], words[-1]["end"]
+    if segments:
+        start, end = fed_to_real(segments, start), fed_to_real(segments, end, end=True)
+    return f"{start:.2f}-{end:.2f}", text
+
+
+def stream_transcribe(audio_q: queue.Queue, rec, csv_path: str):
+    # audio_q에서 None을 받으면 남은 결과를 정리하고 종료
+    partial = ""
+    with open(csv_path, "w", newline="", encoding="utf-8") as out:
+        w = csv.writer(out)
+        w.writerow(["음성 파일내에서의 시간", "인식된 텍스트"])
+        out.flush()
+
+        def emit(j: dict):
+            nonlocal partial
+            row = result_row(j)
+            if partial:
+                print("\r" + " " * len(partial) + "\r", end="")
+                partial = ""
+            if row:
+                w.writerow(row)
+                out.flush()
+                print(f"[STT] {row[0]}  {row[1]}")
+
+        while (data := audio_q.get()) is not None:
+            if rec.AcceptWaveform(to_pcm16(data)):
+                emit(json.loads(rec.Result()))
+            else:
+                text = json.loads(rec.PartialResult()).get("partial", "")
+                if text and text != partial:
+                    print("\r" + text.ljust(len(partial)), end="", flush=True)
+                    partial = text
+        emit(json.loads(rec.FinalResult()))
+
+
+def record_once(stream: bool = False, model_path: str | None = None):
     device = sd.default.device[0]
     print("[안내] 기본 마이크 장치 ID:", device)
     if device is None:
@@ -40,6 +111,18 @@ def record_once():
 
     print("\n[안내] 녹음 파일 경로:", filepath)
 
+    # 스트리밍: 녹음을 시작하기 전에 모델을 불러와서 녹음 초반 블록이 큐에 쌓이지 않게 한다
+    stt_q: queue.Queue | None = None
+    consumer = None
+    if stream:
+        csv_path = os.path.splitext(filepath)[0] + ".CSV"
+        stt_q = queue.Queue()
+        consumer = threading.Thread(
+            target=stream_transcribe, args=(stt_q, new_recognizer(model_path, sr), csv_path), daemon=True
+        )
+        consumer.start()
+        print("[안내] 실시간 변환 결과 경로:", csv_path)
+
     try:
         devinfo: Any | dict[str, Any] = sd.query_devices(device, 'input')
         print(f"[장치] {devinfo.get('name')} / 채널={devinfo.get('max_input_channels')} / 기본 SR={int(devinfo.get('default_samplerate', sr))}")
@@ -63,7 +146,6 @@ def record_once():
             sd.InputStream(samplerate=sr, device=device, channels=channels, callback=callback) # device buffer에 녹음하면 주기적으로 callback 되면서 큐에 저장
         ):
             try: # 사용자 입력 받아서 녹음 종료하는 용도로 스레드 생성해서 따로 돌림.. '\n' 입력하면 정상 종료됨.
-                import threading
                 stop = threading.Event()
 
                 def wait_enter():
@@ -80,6 +162,8 @@ def record_once():
                     try:
                         data = q.get(timeout=0.1) #계속 큐에서 대기 안하고 100ms 마다 stop 이벤트 확인
                         f.write(data) # 파일에 녹음하기
+                        if stt_q is not None:
+                            stt_q.put(data) # 같은 블록을 변환 스레드에도 전달
                     except queue.Empty: # 비어있는 경우는 거의 없긴함.. 그래도 예외처리
                         pass
             except KeyboardInterrupt:
@@ -90,12 +174,46 @@ def record_once():
     except Exception as e:
         print("[오류] 녹음 중 문제가 발생했습니다:", e)
         return
+    finally:
+        if consumer is not None:
+            stt_q.put(None) # 남은 블록까지 변환하고 종료
+            consumer.join()
 
     print("[완료] 저장됨 →", filepath)
+    if stream and os.path.exists(csv_path):
+        # 다음 일괄 변환에서 이 녹음을 다시 변환하지 않도록 manifest에 기록
+        manifest = load_manifest()
+        record_done(manifest, filepath, csv_path, model_id(model_path))
+        save_manifest(manifest)
 
 
 ## <---------- 녹음 파일 읽는 메서드 ----------> ##
 
+# Vosk 모델 캐시: 모델 경로 -> 로드된 Model. 한 프로세스에서 같은 모델은 한 번만 디스크에서 읽는다
+_MODELS: dict = {}
+
+
+def model_key(model_path: str | None) -> str | None:
+    return os.path.abspath(model_path) if model_path else None
+
+
+def get_model(model_path: str | None = None):
+    from vosk import Model
+    key = model_key(model_path)
+    if key not in _MODELS:
+        print(f"[STT] 모델 로드: {model_path}")
+        _MODELS[key] = Model(model_path)
+    return _MODELS[key]
+
+
+def new_recognizer(model_path: str | None, sr: int):
+    # 모델은 공유하고 인식기(KaldiRecognizer)는 파일마다 새로 만든다 (인식 상태가 파일 사이에 섞이지 않도록)
+    from vosk import KaldiRecognizer
+    rec = KaldiRecognizer(get_model(model_path), sr)
+    rec.SetWords(True)
+    return rec
+
+
 def list_record_wavs() -> list[str]:
     pattern = os.path.join(RECORDS_DIR, "*.wav")
     files = glob.glob(pattern)
@@ -103,55 +221,91 @@ def list_record_wavs() -> list[str]:
     return files
 
 
-def stt_transcribe_wav_to_csv(wav_path: str, model_path: str | None = None) -> str | None:
-    from vosk import Model, KaldiRecognizer
+## <---------- 무음 구간 건너뛰기(VAD) ----------> ##
+
+def vad_mask(f, block: int) -> ndarray:
+    # 블록마다 음성이면 True. 파일을 VAD_CHUNK_BLOCKS 단위로 읽어 블록 통계를 한 번에 계산한다
+    flags = []
+    f.seek(0)
+    while len(data := f.read(frames=block * VAD_CHUNK_BLOCKS, dtype="int16", always_2d=True)):
+        x = data.astype(np.float32).mean(axis=1)
+        n = -(-len(x) // block)
+        x = np.pad(x, (0, n * block - len(x))).reshape(n, block)
+        rms = np.sqrt(np.mean(x * x, axis=1))
+        zcr = np.mean(np.signbit(x[:, 1:]) != np.signbit(x[:, :-1]), axis=1)
+        flags.append((rms >= VAD_ENERGY) | ((rms >= VAD_ENERGY * VAD_WEAK_RATIO) & (zcr >= VAD_ZCR)))
+    f.seek(0)
+    voiced = np.concatenate(flags) if flags else np.zeros(0, dtype=bool)
+    if VAD_PAD and voiced.any():
+        # 앞뒤 VAD_PAD 블록까지 음성으로 넓힌다 (2 x VAD_PAD 블록보다 짧은 무음은 그대로 공급)
+        # "same"는 파일이 커널보다 짧으면 커널 길이로 늘어나므로 "full"에서 원래 길이만큼 잘라낸다
+        voiced = np.convolve(voiced, np.ones(2 * VAD_PAD + 1))[VAD_PAD:VAD_PAD + len(voiced)] > 0
+    return voiced
+
+
+def voiced_runs(voiced: ndarray) -> list[tuple[int, int]]:
+    # 연속된 음성 블록 구간 [(시작 블록, 끝 블록), ...]
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+def fed_to_real(segments: list[tuple[float, float]], t: float, end: bool = False) -> float:
+    # segments: (recognizer에 공급한 누적 시간, 원래 파일 시간) 구간 시작점 목록
+    # 구간 경계에 걸린 단어 끝 시간은 앞 구간으로 본다
+    i = (bisect.bisect_left if end else bisect.bisect_right)([fed for fed, _ in segments], t) - 1
+    fed, real = segments[max(i, 0)]
+    return t - fed + real
+
+
+def stt_transcribe_wav_to_csv(wav_path: str, model_path: str | None = None, verbose: bool = True,
+                              vad: bool = VAD) -> str | None:
     # 결과 CSV 경로
     csv_path = os.path.splitext(wav_path)[0] + ".CSV"
 
-    # 모델 로드
-    print(f"[STT] 모델 로드: {model_path}")
-    model = Model(model_path)
-
     # 스트리밍으로 읽으며 처리 (메모리 절약)
     with sf.SoundFile(wav_path, "r") as f:
         sr = f.samplerate
 
-        # KaldiRecognizer에 samplerate 전달
-        rec = KaldiRecognizer(model, sr)
-        rec.SetWords(True)
+        # KaldiRecognizer에 samplerate 전달 (모델은 캐시에서 공유)
+        rec = new_recognizer(model_path, sr)
 
         rows: list[tuple[str, str]] = []
         # 0.1초(= sr/10 프레임) 단위로 읽기
         block = max(1, sr // 10)
 
-        while True:
-            # int16로 읽으면 바로 PCM 바이트로 넘기기 쉬움
-            data = f.read(frames=block, dtype="int16")
-            if len(data) == 0:
-                break
-
-            # Vosk에 공급 (바이트)
-            ok = rec.AcceptWaveform(data.tobytes())
-            if ok:
-                j = json.loads(rec.Result())
-                # j 예: {"result":[{"word":"...", "start":0.12, "end":0.45}, ...], "text":"..."}
-                if "result" in j:
-                    words = j["result"]
-                    text = j.get("text", "").strip()
-                    if words and text:
-                        start = words[0]["start"]
-                        end = words[-1]["end"]
-                        rows.append((f"{start:.2f}-{end:.2f}", text))
+        # 음성 구간만 공급하고, 구간마다 (공급한 시간, 원래 시간)을 기록해서 CSV 시간은 원래 파일 기준으로 쓴다
+        if vad:
+            voiced = vad_mask(f, block)
+            runs = voiced_runs(voiced)
+        else:
+            voiced = None
+            runs = [(0, -(-f.frames // block))]
+        segments: list[tuple[float, float]] = []
+        fed = 0
+
+        for first, last in runs:
+            f.seek(first * block)
+            segments.append((fed / sr, first * block / sr))
+            for _ in range(first, last):
+                # int16로 읽으면 바로 PCM 바이트로 넘기기 쉬움
+                data = f.read(frames=block, dtype="int16")
+                if len(data) == 0:
+                    break
+                fed += len(data)
+
+                # Vosk에 공급 (바이트)
+                ok = rec.AcceptWaveform(data.tobytes())
+                if ok:
+                    # j 예: {"result":[{"word":"...", "start":0.12, "end":0.45}, ...], "text":"..."}
+                    if row := result_row(json.loads(rec.Result()), segments):
+                        rows.append(row)
 
         # 마지막 누적 결과
-        j = json.loads(rec.FinalResult())
-        if "result" in j:
-            words = j["result"]
-            text = j.get("text", "").strip()
-            if words and text:
-                start = words[0]["start"]
-                end = words[-1]["end"]
-                rows.append((f"{start:.2f}-{end:.2f}", text))
+        if row := result_row(json.loads(rec.FinalResult()), segments):
+            rows.append(row)
+
+        if verbose and voiced is not None and f.frames:
+            print(f"[STT] 무음 건너뜀: {1 - fed / f.frames:.0%} (음성 구간 {len(runs)}개)")
 
     # CSV 저장 (UTF-8)
     os.makedirs(os.path.dirname(csv_path), exist_ok=True)
@@ -161,6 +315,9 @@ def stt_transcribe_wav_to_csv(wav_path: str, model_path: str | None = None) -> s
         for t, txt in rows:
             w.writerow([t, txt])
 
+    if not verbose:
+        return csv_path
+
     # 콘솔에 간단 프리뷰(인식 품질 확인용)
     print(f"[STT] 저장 완료: {csv_path}")
     for preview in rows[:3]:
@@ -171,24 +328,174 @@ def stt_transcribe_wav_to_csv(wav_path: str, model_path: str | None = None) -> s
     return csv_path
 
 
-def stt_process_records(model_path: str | None = None):
-    files = list_record_wavs()
-    if not files:
+## <---------- 병렬 변환 (프로세스 풀) ----------> ##
+
+def total_memory_mb() -> int | None:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError): # Windows 등 sysconf가 없는 환경
+        return None
+
+
+def plan_workers(workers: int, memory_mb: int | None, files: int) -> int:
+    # 워커마다 모델을 따로 올리므로 메모리 예산(워커당 MB) 안에서만 늘린다
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    total = total_memory_mb()
+    if memory_mb and total:
+        workers = min(workers, max(1, total // memory_mb))
+    return max(1, min(workers, files))
+
+
+def _transcribe_worker(task: tuple) -> tuple:
+    # 모델은 fork로 부모의 캐시를 물려받고, spawn 환경에서는 첫 파일에서 불러온다 (실패해도 파일별 오류로 끝남)
+    wav, model_path, vad = task
+    try:
+        return wav, stt_transcribe_wav_to_csv(wav, model_path=model_path, verbose=False, vad=vad), None
+    except Exception as e: # MemoryError 포함, 한 파일 실패가 전체 배치를 멈추지 않도록
+        return wav, None, f"{type(e).__name__}: {e}"
+
+
+## <---------- 변환 기록(manifest) ----------> ##
+# 녹음 파일별 (크기, 수정 시각, 내용 해시, 모델 id, CSV 경로)를 저장해두고 새로 생겼거나 바뀐 파일만 다시 변환한다.
+# 크기/수정 시각이 같으면 해시도 계산하지 않으므로 다시 실행할 때 비용은 새 파일 수에 비례한다.
+
+def model_id(model_path: str | None) -> str:
+    # 모델 폴더 이름 + 수정 시각. 모델을 바꾸거나 다시 받으면 달라져서 이전 CSV를 오래된 것으로 본다
+    if not model_path:
+        return "default"
+    key = model_key(model_path)
+    try:
+        return f"{os.path.basename(key)}@{int(os.path.getmtime(key))}"
+    except OSError:
+        return os.path.basename(key)
+
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_BLOCK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: dict, path: str = MANIFEST_PATH):
+    # 중간에 끊겨도 manifest가 깨지지 않도록 임시 파일에 쓰고 교체
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def record_done(manifest: dict, wav: str, csv_path: str, model: str, digest: str | None = None):
+    st = os.stat(wav)
+    manifest[os.path.relpath(wav, RECORDS_DIR)] = {
+        "size": st.st_size,
+        "mtime": st.st_mtime,
+        "hash": digest or file_hash(wav),
+        "model": model,
+        "csv": os.path.relpath(csv_path, RECORDS_DIR),
+    }
+
+
+def pending_records(files: list[str], manifest: dict, model: str) -> list[tuple[str, str]]:
+    # (wav, 이유) 목록. 이유: new / changed / stale(모델 변경) / missing csv
+    pending = []
+    for wav in files:
+        entry = manifest.get(os.path.relpath(wav, RECORDS_DIR))
+        if entry is None:
+            pending.append((wav, "new"))
+            continue
+        if not os.path.exists(os.path.join(RECORDS_DIR, entry["csv"])):
+            pending.append((wav, "missing csv"))
+            continue
+        st = os.stat(wav)
+        if st.st_size != entry["size"] or st.st_mtime != entry["mtime"]:
+            # 수정 시각만 바뀐 경우(복사, touch)는 내용 해시로 확인하고 기록만 갱신
+            digest = file_hash(wav)
+            if digest != entry["hash"]:
+                pending.append((wav, "changed"))
+                continue
+            entry["size"], entry["mtime"] = st.st_size, st.st_mtime
+        if entry["model"] != model:
+            pending.append((wav, "stale"))
+    return pending
+
+
+def stt_process_records(model_path: str | None = None, workers: int = WORKERS, memory_mb: int | None = None,
+                        force: bool = False, vad: bool = VAD):
+    all_files = list_record_wavs()
+    if not all_files:
         print("[STT] 처리할 WAV 파일이 없습니다. records 폴더를 확인하세요.")
         return
-    print(f"[STT] 대상 파일 수: {len(files)}")
-    for i, wav in enumerate(files, 1):
-        print(f"[{i}/{len(files)}] {os.path.basename(wav)}")
-        stt_transcribe_wav_to_csv(wav, model_path=model_path)
+
+    model = model_id(model_path)
+    manifest = {} if force else load_manifest()
+    # 지워진 녹음 파일의 기록은 정리
+    existing = {os.path.relpath(wav, RECORDS_DIR) for wav in all_files}
+    manifest = {k: v for k, v in manifest.items() if k in existing}
+    pending = pending_records(all_files, manifest, model)
+    save_manifest(manifest)
+    if not pending:
+        print(f"[STT] 모든 파일({len(all_files)}개)이 이미 변환되어 있습니다.")
+        return
+    reasons = {}
+    for _, reason in pending:
+        reasons[reason] = reasons.get(reason, 0) + 1
+    print(f"[STT] 대상 파일 수: {len(pending)} / 전체 {len(all_files)} ({', '.join(f'{k} {v}' for k, v in reasons.items())})")
+    files = [wav for wav, _ in pending]
+
+    workers = plan_workers(workers, memory_mb, len(files))
+    if workers == 1:
+        get_model(model_path) # 모델은 여기서 한 번만 로드하고 모든 파일이 공유
+        for i, wav in enumerate(files, 1):
+            print(f"[{i}/{len(files)}] {os.path.basename(wav)}")
+            csv_path = stt_transcribe_wav_to_csv(wav, model_path=model_path, vad=vad)
+            record_done(manifest, wav, csv_path, model)
+            save_manifest(manifest)
+        return
+
+    # 파일마다 CSV는 워커가 바로 쓰고, 끝난 순서대로 진행 상황을 출력
+    print(f"[STT] 워커 {workers}개로 병렬 처리" + (f" (워커당 메모리 {memory_mb}MB)" if memory_mb else ""))
+    tasks = [(wav, model_path, vad) for wav in files]
+    # 워커 초기화에서 모델 로드가 실패하면 Pool이 워커를 계속 다시 띄우므로, 부모에서 먼저 한 번 불러서 잘못된 모델은 바로 실패시킨다
+    get_model(model_path)
+    with mp.Pool(workers) as pool:
+        for i, (wav, csv_path, error) in enumerate(pool.imap_unordered(_transcribe_worker, tasks), 1):
+            if error:
+                print(f"[{i}/{len(files)}] {os.path.basename(wav)}  [오류] {error}")
+            else:
+                print(f"[{i}/{len(files)}] {os.path.basename(wav)} -> {csv_path}")
+                record_done(manifest, wav, csv_path, model)
+                save_manifest(manifest)
 
 
 def main():
-    ans = input("녹음을 시작할까요? (y/N): ").strip().lower()
-    if ans not in ("y", "yes"):
-        print("종료합니다.")
-        return
-    record_once()
-    stt_process_records('./vosk/vosk-model-small-en-us-0.15')
+    parser = argparse.ArgumentParser(description="javis recorder / STT")
+    parser.add_argument("--stt-only", action="store_true", help="skip recording and transcribe records/ only")
+    parser.add_argument("--model", default=MODEL_PATH, help=f"Vosk model path (default: {MODEL_PATH})")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="transcription processes, 0 = cpu count")
+    parser.add_argument("--memory-mb", type=int, help="memory budget per worker in MB (caps the worker count)")
+    parser.add_argument("--force", action="store_true", help="ignore the manifest and transcribe every recording")
+    parser.add_argument("--stream", action="store_true", help="transcribe live while recording")
+    parser.add_argument("--no-vad", action="store_true", help="feed silent stretches to the recognizer too")
+    args = parser.parse_args()
+
+    if not args.stt_only:
+        ans = input("녹음을 시작할까요? (y/N): ").strip().lower()
+        if ans not in ("y", "yes"):
+            print("종료합니다.")
+            return
+        record_once(stream=args.stream, model_path=args.model)
+    stt_process_records(args.model, workers=args.workers, memory_mb=args.memory_mb, force=args.force, vad=not args.no_vad)
 
 
 if __name__ == "__main__":